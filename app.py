@@ -1,18 +1,52 @@
+import os
 import streamlit as st
 from datetime import datetime, timedelta
-import time
-from optimized_bbfs_system import get_optimized_system
+from charts import build_figures, ledger_series
+from draw_watcher import THROTTLED, DrawWatcher
+from memory_report import MemoryMonitor
+from optimized_bbfs_system import get_system_store
+
+WATCH_TICK = "15s"  # interval fragment membaca ulang state (lokal, tanpa request ke sumber)
+MIN_REFRESH_INTERVAL = 10  # detik; refresh lebih rapat menerima hasil refresh terakhir
+# tracemalloc untuk diff alokasi antar refresh: overhead alokasi, aktifkan dengan BBFS_MEMORY_TRACE=1
+MEMORY_TRACE = os.environ.get("BBFS_MEMORY_TRACE") == "1"
 
 # Configure for production deployment
 @st.cache_resource
-def load_system():
-    """Load system with caching for better performance"""
+def load_store():
+    """Load store snapshot system with caching for better performance"""
     try:
-        return get_optimized_system()
+        return get_system_store()
     except Exception as e:
         st.error(f"Error loading system: {str(e)}")
         return None
 
+@st.cache_resource
+def load_memory_monitor(_store):
+    """Satu monitor memori per proses; mencatat setiap snapshot yang dipublish"""
+    monitor = MemoryMonitor(trace=MEMORY_TRACE)
+    _store.listeners.append(monitor.record)
+    if _store.current.data:
+        monitor.record(_store.current, 'initial')
+    return monitor
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_figures(ledger_version, _system):
+    """Figure chart per versi ledger (versi pola, jumlah transisi): dibangun sekali per draw baru"""
+    series = ledger_series(_system)
+    return build_figures(series) if series else None
+
+@st.cache_resource
+def load_watcher(_store):
+    """Satu poller draw baru per proses, dipakai bersama semua session"""
+    return DrawWatcher(_store, min_refresh_interval=MIN_REFRESH_INTERVAL).start()
+
+def initial_load(system):
+    """Isi clone snapshot pertama (dipanggil lewat store.update)"""
+    # Cold start: render dari warm-start bundle, refresh live menyusul lewat
+    # watcher di background. Tanpa bundle: fetch (sumber down -> snapshot last good)
+    return system.load_bundle() or system.fetch_complete_data()
+
 def main():
     st.set_page_config(
         page_title="BBFS Analytics Pro", 
@@ -293,13 +327,15 @@ def main():
     </style>
     """, unsafe_allow_html=True)
     
-    # Initialize system with caching
-    system = load_system()
+    # Initialize system with caching; reader memakai satu snapshot per render
+    store = load_store()
     
-    if system is None:
+    if store is None:
         st.error("Gagal memuat sistem. Silakan refresh halaman.")
         st.stop()
     
+    memory_monitor = load_memory_monitor(store)
+    
     # Header
     st.markdown("""
     <div class="header-container">
@@ -311,46 +347,43 @@ def main():
     if 'data_loaded' not in st.session_state:
         st.session_state.data_loaded = False
     
+    # Data dimuat sekali per proses; session berikutnya memakai state bersama
+    # yang dijaga watcher (tidak ada fetch tambahan per session)
+    if not st.session_state.data_loaded and store.current.data:
+        st.session_state.data_loaded = True
+    
     if not st.session_state.data_loaded:
         try:
-            if system.fetch_complete_data():
-                system.run_performance_test()
+            # Session yang datang bersamaan saat cold start menunggu load yang sama
+            published, _ = store.refresh('initial_load', initial_load, MIN_REFRESH_INTERVAL)
+            if published:
                 st.session_state.data_loaded = True
             else:
-                st.error("Gagal memuat data. Menggunakan mode demo.")
+                st.error("Gagal memuat data dan snapshot tidak tersedia. Menggunakan mode demo.")
                 st.session_state.data_loaded = True
         except Exception as e:
             st.error(f"Error memuat data: {str(e)}")
             st.session_state.data_loaded = True
     
-    # Status - selalu tampilkan sesuatu
-    if system.data and len(system.data) > 0:
-        performance = system.get_performance_summary()
-        if performance:
-            status_color = "#00d2d3" if performance['max_consecutive_loss'] <= 10 else "#ff6b6b"
-            status_icon = "●" if performance['max_consecutive_loss'] <= 10 else "●"
-            st.markdown(f"""
-            <div class="status-badge">
-                <span style="color: {status_color};">{status_icon}</span> Max {performance['max_consecutive_loss']} Loss | 
-                Win {performance['win_rate']:.1f}% | {performance['total_tests']:,} Data
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="status-badge">MEMPROSES DATA...</div>', unsafe_allow_html=True)
-    else:
-        st.markdown('<div class="status-badge">MEMUAT SISTEM...</div>', unsafe_allow_html=True)
+    watcher = load_watcher(store)
+    
+    # Fragment di bawah dirender ulang sendiri setiap WATCH_TICK dari snapshot
+    # terbaru di store (dipublish watcher), tanpa rerun seluruh halaman
+    render_status(store)
     
     # Auto Refresh Button
     if st.button("Auto Refresh Data", type="primary", use_container_width=True):
         with st.spinner("Memperbarui data real-time..."):
-            if system.fetch_complete_data():
-                system.run_performance_test()
+            polled = watcher.poll_now()
+            if polled == THROTTLED:
+                st.info(f"Data baru saja diperiksa, coba lagi dalam {watcher.min_refresh_interval} detik")
+            elif polled:
                 st.success("Data berhasil diperbarui!")
-                time.sleep(1)
             else:
-                st.error("Gagal memperbarui data")
+                st.info("Tidak ada draw baru")
     
     # Sidebar - Data info
+    system = store.current
     with st.sidebar:
         data_info = system.get_data_info()
         if data_info:
@@ -362,11 +395,98 @@ def main():
             performance = system.get_performance_summary()
             if performance:
                 st.markdown("### Performance")
+                intervals = system.get_bootstrap_intervals()
                 st.metric("Max Loss Streak", performance['max_consecutive_loss'])
+                if intervals:
+                    st.caption(f"CI 95%: {intervals['max_streak']['low']:.0f} - {intervals['max_streak']['high']:.0f}")
                 st.metric("Win Rate", f"{performance['win_rate']:.1f}%")
+                if intervals:
+                    st.caption(f"CI 95%: {intervals['win_rate']['low']:.1f}% - {intervals['win_rate']['high']:.1f}%")
                 target_status = "Tercapai" if performance['max_consecutive_loss'] <= 10 else "Belum Tercapai"
                 st.metric("Target ≤10 Loss", target_status)
+        
+        # Counter single-flight: request refresh yang digabung ke satu poll sumber
+        flight = store.flight.stats('source_poll')
+        if flight:
+            st.markdown("### Refresh")
+            st.text(f"{flight['executed']} poll sumber dari {flight['requests']} request")
+            st.text(f"Digabung: {flight['coalesced']} | Throttle: {flight['throttled']}")
+        
+        render_memory(memory_monitor)
     
+    render_prediction(store)
+    render_loss_streak(store)
+    render_loss_statistics(store)
+    render_charts(store)
+    render_realtime(store, watcher)
+
+
+def _format_bytes(size):
+    return f"{size / 1024 / 1024:.2f} MB" if size is not None else "-"
+
+def _format_delta(size):
+    return f"{size / 1024:+.1f} KB" if size is not None else None
+
+def render_memory(monitor):
+    """Ukuran komponen engine + diff alokasi antar refresh (sidebar)"""
+    report = monitor.latest()
+    if not report:
+        return
+    st.markdown("### Memori")
+    st.metric("Engine (deep size)", _format_bytes(report['total']), _format_delta(report['deltas']['total']),
+              delta_color="inverse")
+    if report['traced'] is not None:
+        st.metric("Traced (tracemalloc)", _format_bytes(report['traced']), _format_delta(report['deltas']['traced']),
+                  delta_color="inverse")
+    if report['rss'] is not None:
+        st.metric("RSS", _format_bytes(report['rss']), _format_delta(report['deltas']['rss']), delta_color="inverse")
+    
+    with st.expander(f"Detail refresh {report['time']}"):
+        for name, size in report['components'].items():
+            delta = report['component_deltas'][name]
+            delta_text = f" ({_format_delta(delta)})" if delta else ""
+            st.text(f"{name}: {_format_bytes(size)}{delta_text}")
+        if report['top_allocations']:
+            st.markdown("**Alokasi bertambah sejak refresh sebelumnya:**")
+            for stat in report['top_allocations']:
+                st.text(f"{_format_delta(stat['size_diff'])} {stat['location']}")
+    st.download_button("Export laporan memori", monitor.export(), file_name="bbfs_memory_report.json",
+                       mime="application/json")
+
+@st.fragment(run_every=WATCH_TICK)
+def render_status(store):
+    """Badge status performa"""
+    system = store.current  # satu snapshot untuk seluruh render fragment
+    # Status - selalu tampilkan sesuatu
+    if system.data and len(system.data) > 0:
+        performance = system.get_performance_summary()
+        if performance:
+            status_color = "#00d2d3" if performance['max_consecutive_loss'] <= 10 else "#ff6b6b"
+            status_icon = "●" if performance['max_consecutive_loss'] <= 10 else "●"
+            st.markdown(f"""
+            <div class="status-badge">
+                <span style="color: {status_color};">{status_icon}</span> Max {performance['max_consecutive_loss']} Loss | 
+                Win {performance['win_rate']:.1f}% | {performance['total_tests']:,} Data
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown('<div class="status-badge">MEMPROSES DATA...</div>', unsafe_allow_html=True)
+        
+        # Indikator staleness: data dari snapshot/memori saat sumber tidak terjangkau
+        freshness = system.get_data_freshness()
+        if freshness['stale']:
+            age = freshness['age_minutes']
+            age_text = f"{age // 60} jam {age % 60} menit" if age is not None else "tidak diketahui"
+            retry_in = freshness['breaker']['retry_in']
+            retry_text = f" | cek ulang sumber dalam {int(retry_in)} detik" if retry_in else ""
+            st.warning(f"Sumber data tidak terjangkau. Menampilkan data terakhir (usia {age_text}){retry_text}.")
+    else:
+        st.markdown('<div class="status-badge">MEMUAT SISTEM...</div>', unsafe_allow_html=True)
+
+@st.fragment(run_every=WATCH_TICK)
+def render_prediction(store):
+    """Prediksi BBFS untuk draw berikutnya"""
+    system = store.current  # satu snapshot untuk seluruh render fragment
     # Main Content - pastikan selalu ditampilkan
     st.markdown('<div class="main-card">', unsafe_allow_html=True)
     st.markdown('<div class="section-title">Prediksi BBFS 5 Angka Optimal</div>', unsafe_allow_html=True)
@@ -387,7 +507,7 @@ def main():
             try:
                 # Generate BBFS untuk latest result
                 input_2d = latest['result'][-2:]
-                bbfs = system.generate_optimized_bbfs(input_2d, indonesian_day)
+                bbfs = system.generate_optimized_bbfs(input_2d, indonesian_day, system.get_live_loss_context())
                 
                 # Show 19/06/2025 kamis as requested
                 target_date = datetime(2025, 6, 19)
@@ -454,12 +574,16 @@ def main():
         """, unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
-    
+
+@st.fragment(run_every=WATCH_TICK)
+def render_loss_streak(store):
+    """Loss streak aktif dari tracker"""
+    system = store.current  # satu snapshot untuk seluruh render fragment
     # Current Loss Streak Analysis
     st.markdown('<div class="section-title">Loss Streak Aktif</div>', unsafe_allow_html=True)
     
     # Calculate current loss streak
-    current_loss_streak, streak_details = system.get_current_loss_streak_analysis(10)
+    current_loss_streak, streak_details = system.get_current_loss_streak_analysis()
     
     # Display current streak
     col1, col2 = st.columns([1, 1])
@@ -527,47 +651,93 @@ def main():
             </div>
             """, unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
-    
+
+@st.fragment(run_every=WATCH_TICK)
+def render_loss_statistics(store):
+    """Distribusi historis loss streak"""
+    system = store.current  # satu snapshot untuk seluruh render fragment
     # Loss Streak Statistics
     st.markdown('<div class="section-title">Statistik Loss Streak</div>', unsafe_allow_html=True)
     loss_stats = system.get_consecutive_loss_breakdown()
+    intervals = system.get_bootstrap_intervals()
+    histogram_ci = intervals['streak_histogram'] if intervals else {}
     if loss_stats and len(loss_stats) > 0:
         st.markdown('<div class="analytics-card">', unsafe_allow_html=True)
         st.markdown("**Distribusi Historis:**")
         
         # Real-time validated loss streak statistics
         st.markdown('<div class="data-table">', unsafe_allow_html=True)
-        st.markdown('<div class="table-row table-header"><span>Streak</span><span>Count</span><span>Persentase</span><span>Status</span></div>', unsafe_allow_html=True)
+        st.markdown('<div class="table-row table-header"><span>Streak</span><span>Count (CI 95%)</span><span>Persentase</span><span>Status</span></div>', unsafe_allow_html=True)
         
         for streak_length, stats in sorted(loss_stats.items()):
             # Extract numeric value from streak_length like "1x", "2x", etc.
             streak_num = int(streak_length.replace('x', ''))
             status = "Normal" if streak_num <= 3 else "Perhatian" if streak_num <= 6 else "Kritis"
+            ci = histogram_ci.get(streak_num)
+            ci_text = f" ({ci['low']:.0f}-{ci['high']:.0f})" if ci else ""
             st.markdown(f"""
             <div class="table-row">
                 <span>{streak_length}</span>
-                <span>{stats["count"]}</span>
+                <span>{stats["count"]}{ci_text}</span>
                 <span>{stats["percentage"]:.1f}%</span>
                 <span>{status}</span>
             </div>
             """, unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
+        if intervals:
+            st.caption(f"CI: block bootstrap {intervals['n_resamples']} resample, blok {intervals['block_length']} draw")
+        
+        # Baseline exact: apakah max loss ini tidak biasa dibanding kebetulan?
+        baseline = system.get_streak_baseline()
+        performance = system.get_performance_summary()
+        if baseline and performance:
+            max_loss = performance['max_consecutive_loss']
+            own = system.get_streak_baseline(performance['win_rate'] / 100)
+            st.caption(
+                f"Baseline BBFS acak (win {baseline['win_probability'] * 100:.1f}%): max loss rata-rata "
+                f"{baseline['expected_max_streak']:.1f}, P(max ≤ {max_loss}) = {baseline['p_at_most_observed'] * 100:.4f}% | "
+                f"Win rate sama, draw independen: P(max ≥ {max_loss}) = {own['p_at_least_observed'] * 100:.1f}%"
+            )
         st.markdown('</div>', unsafe_allow_html=True)
-    
+
+@st.fragment(run_every=WATCH_TICK)
+def render_charts(store):
+    """Grafik ledger backtest (di-downsample, payload tetap kecil)"""
+    system = store.current  # satu snapshot untuk seluruh render fragment
+    tracker = system.streak_tracker
+    figures = load_figures((tracker.pattern_version, tracker.total_tests), system)
+    if not figures:
+        return
+    
+    st.markdown('<div class="section-title">Grafik Performa</div>', unsafe_allow_html=True)
+    config = {'displayModeBar': False}
+    rolling_tab, streak_tab, weekday_tab = st.tabs(["Rolling Win Rate", "Timeline Streak", "Per Hari"])
+    with rolling_tab:
+        st.plotly_chart(figures['rolling'], use_container_width=True, config=config)
+    with streak_tab:
+        st.plotly_chart(figures['streak'], use_container_width=True, config=config)
+    with weekday_tab:
+        st.plotly_chart(figures['weekday'], use_container_width=True, config=config)
+
+@st.fragment(run_every=WATCH_TICK)
+def render_realtime(store, watcher):
+    """Tabel win/loss data terbaru"""
     # Latest Results with Win/Loss Analysis
     st.markdown('<div class="section-title">Data Real-Time Terbaru</div>', unsafe_allow_html=True)
     
-    # Refresh button
+    # Refresh button: poll manual watcher, hanya fragment ini yang dirender ulang
     if st.button("Refresh Data Terbaru", key="refresh_realtime", use_container_width=True, type="primary"):
         with st.spinner("Mengambil data real-time..."):
-            if system.fetch_complete_data():
-                system.run_performance_test()
+            polled = watcher.poll_now()
+            if polled == THROTTLED:
+                st.info(f"Data baru saja diperiksa, coba lagi dalam {watcher.min_refresh_interval} detik")
+            elif polled:
                 st.success("Data terbaru berhasil dimuat!")
-                time.sleep(0.8)
-                st.rerun()
             else:
-                st.error("Gagal mengambil data terbaru")
+                st.info("Tidak ada draw baru")
+    
+    system = store.current  # satu snapshot (setelah refresh) untuk seluruh render fragment
     
     # Get real-time analysis data
     realtime_analysis = system.get_real_time_analysis(8)
@@ -647,5 +817,6 @@ def main():
         </div>
         """, unsafe_allow_html=True)
 
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Batch prediction CLI: stream baris (result-atau-2D, hari) dari file/stdin
+dan tulis BBFS untuk setiap baris.
+
+Prediksi di-precompile sekali per (2D, hari). Untuk strategi dengan fill
+acak (ultra, defensive, aggressive, balanced) artinya satu draw acak
+dibekukan per key: input yang sama selalu mendapat BBFS yang sama dalam satu
+run (pakai --seed agar reproducible antar run).
+
+Kolom pertama harus berupa digit ASCII saja (2D atau result, min. 2 digit);
+baris lain ditulis sebagai ERROR.
+
+Contoh:
+    python bbfs_cli.py input.csv > output.csv
+    cat input.csv | python bbfs_cli.py --strategy aggressive --seed 42
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+
+from optimized_bbfs_system import OptimizedBBFSSystem, SNAPSHOT_PATH, DAYS
+from ultra_smart_bbfs import UltraSmartBBFS, DAYS as ULTRA_DAYS, DAY_MAP
+
+STRATEGIES = ["optimized", "ultra", "defensive", "aggressive", "balanced"]
+RANDOM_FILL_STRATEGIES = {"ultra", "defensive", "aggressive", "balanced"}
+READ_CHUNK = 1 << 20
+WRITE_BUFFER = 1 << 20
+
+
+def load_engine(strategy, snapshot_path=SNAPSHOT_PATH, fetch=False, seed=None):
+    """Load engine dari snapshot lokal; fetch dari network hanya jika diminta atau snapshot belum ada"""
+    engine = OptimizedBBFSSystem() if strategy == "optimized" else UltraSmartBBFS(seed)
+
+    if not fetch and os.path.exists(snapshot_path) and engine.load_snapshot(snapshot_path):
+        return engine
+
+    # Fetch selalu lewat OptimizedBBFSSystem agar snapshot tersimpan dalam satu format
+    fetcher = engine if strategy == "optimized" else OptimizedBBFSSystem()
+    if not fetcher.fetch_complete_data():
+        raise RuntimeError("Gagal mengambil data dari sumber")
+    fetcher.save_snapshot(snapshot_path)
+
+    if fetcher is not engine and not engine.load_snapshot(snapshot_path):
+        raise RuntimeError(f"Gagal memuat snapshot {snapshot_path}")
+    return engine
+
+
+def compile_lookup(engine, strategy, delimiter=",", loss_context=0):
+    """Compile tabel lookup: key (2D + teks hari apa adanya) -> baris output siap tulis"""
+    if strategy == "optimized":
+        table = engine.build_prediction_table(loss_context)
+        day_names = DAYS
+    else:
+        table = engine.build_prediction_table(strategy)
+        day_names = ULTRA_DAYS
+
+    lookup = {}
+    for alias, ultra_day in DAY_MAP.items():
+        idx = ULTRA_DAYS.index(ultra_day)
+        day = day_names[idx]
+        output_day = DAYS[idx]
+        for n in range(100):
+            input_2d = f"{n:02d}"
+            line = f"{input_2d}{delimiter}{output_day}{delimiter}{''.join(table[(day, input_2d)])}\n"
+            for variant in (alias, alias.capitalize(), alias.upper()):
+                lookup[input_2d + variant] = line
+    return lookup
+
+
+def _valid_value(value):
+    """Result/2D valid: hanya digit ASCII, minimal 2 digit"""
+    return len(value) >= 2 and value.isascii() and value.isdigit()
+
+
+def _slow_lookup(line, lookup, delimiter):
+    """Fallback untuk baris dengan spasi/format tidak standar"""
+    value, _, day = line.partition(delimiter)
+    value = value.strip()
+    day = day.strip().lower()
+    if not _valid_value(value):
+        return None
+    return lookup.get(value[-2:] + day)
+
+
+def predict_lines(lines, lookup, delimiter=","):
+    """Return (list baris output, jumlah baris invalid) untuk satu batch input"""
+    get = lookup.get
+    out = []
+    append = out.append
+    invalid = 0
+    for line in lines:
+        value, _, day = line.partition(delimiter)
+        row = get(value[-2:] + day) if _valid_value(value) else None
+        if row is None:
+            if not line.strip():
+                continue
+            row = _slow_lookup(line, lookup, delimiter)
+            if row is None:
+                invalid += 1
+                row = f"{line.strip()}{delimiter}ERROR\n"
+        append(row)
+    return out, invalid
+
+
+def stream(infile, outfile, lookup, delimiter=","):
+    """Stream input per chunk besar dan tulis output secara buffered.
+
+    Return (jumlah baris output - prediksi atau ERROR, jumlah baris invalid).
+    """
+    total = 0
+    invalid = 0
+    tail = ""
+    while True:
+        chunk = infile.read(READ_CHUNK)
+        if not chunk:
+            break
+        lines = (tail + chunk).split("\n")
+        tail = lines.pop()
+        out, bad = predict_lines([l.rstrip("\r") for l in lines] if "\r" in chunk else lines, lookup, delimiter)
+        outfile.write("".join(out))
+        total += len(out)  # baris kosong tidak menghasilkan output dan tidak dihitung
+        invalid += bad
+    if tail:
+        out, bad = predict_lines([tail.rstrip("\r")], lookup, delimiter)
+        outfile.write("".join(out))
+        total += len(out)
+        invalid += bad
+    outfile.flush()
+    return total, invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch BBFS prediction dari file/stdin")
+    parser.add_argument("input", nargs="?", default="-", help="File input (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="File output (default: stdout)")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="optimized",
+                        help="Strategi selain optimized memakai fill acak yang dibekukan per (2D, hari)")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="Path snapshot data lokal")
+    parser.add_argument("--fetch", action="store_true", help="Ambil data terbaru dan perbarui snapshot")
+    parser.add_argument("--loss-context", type=int, default=0, help="Loss context untuk engine optimized")
+    parser.add_argument("--seed", type=int, default=None, help="Seed untuk strategi ultra (fill random)")
+    parser.add_argument("--delimiter", default=",")
+    args = parser.parse_args(argv)
+
+    # Log progress engine ke stderr agar stdout hanya berisi prediksi
+    with contextlib.redirect_stdout(sys.stderr):
+        engine = load_engine(args.strategy, args.snapshot, args.fetch, args.seed)
+        lookup = compile_lookup(engine, args.strategy, args.delimiter, args.loss_context)
+        if args.strategy in RANDOM_FILL_STRATEGIES:
+            print(f"Catatan: strategi {args.strategy} memakai fill acak; satu draw dibekukan per (2D, hari)"
+                  f"{'' if args.seed is not None else ' (tanpa --seed, berbeda antar run)'}")
+
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", buffering=WRITE_BUFFER)
+    try:
+        total, invalid = stream(infile, outfile, lookup, args.delimiter)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    print(f"✓ {total:,} baris diproses ({invalid:,} invalid)", file=sys.stderr)
+    return 0 if invalid == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+RNG layer reproducible untuk jalur fill/shuffle UltraSmartBBFS.
+
+Setiap stream men-generate blok permutasi 0-9 sekaligus dengan NumPy,
+sehingga satu prediksi cukup mengambil satu permutasi (tanpa rejection
+loop random.randint / random.shuffle per digit).
+"""
+
+import zlib
+
+import numpy as np
+
+STREAM_BLOCK = 4096
+_ARANGE_10 = np.arange(10, dtype=np.uint8)
+
+
+def _stream_key(part):
+    """Key spawn harus integer; string di-hash stabil (crc32)"""
+    if isinstance(part, str):
+        return zlib.crc32(part.encode("utf-8"))
+    return int(part)
+
+
+class PermutationStream:
+    """Stream permutasi digit 0-9 dengan seed, di-generate per blok"""
+
+    def __init__(self, seed=None, block_size=STREAM_BLOCK):
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+        self.blocks_generated = 0
+        self._block = []
+        self._pos = 0
+
+    @classmethod
+    def spawn(cls, seed, *key, block_size=STREAM_BLOCK):
+        """Stream independen untuk (seed, key...), mis. (seed, "ultra", replicate).
+
+        Seed yang sama dan key yang sama selalu memberi stream identik;
+        seed None memberi entropy acak.
+        """
+        sequence = np.random.SeedSequence(seed, spawn_key=tuple(_stream_key(k) for k in key))
+        return cls(sequence, block_size)
+
+    def _refill(self):
+        block = self.generator.permuted(np.tile(_ARANGE_10, (self.block_size, 1)), axis=1)
+        text = (block + 48).tobytes().decode("ascii")
+        self._block = [text[i:i + 10] for i in range(0, len(text), 10)]
+        self._pos = 0
+        self.blocks_generated += 1
+
+    def permutation(self):
+        """Return permutasi berikutnya sebagai string 10 digit, mis. "3807159462" """
+        if self._pos >= len(self._block):
+            self._refill()
+        perm = self._block[self._pos]
+        self._pos += 1
+        return perm
+
+    def fill(self, bbfs, size=5):
+        """Tambah digit acak berbeda ke bbfs (in place) sampai panjang size"""
+        if len(bbfs) < size:
+            for digit in self.permutation():
+                if digit not in bbfs:
+                    bbfs.append(digit)
+                    if len(bbfs) >= size:
+                        break
+        return bbfs
+
+    def shuffle_digits(self, digits):
+        """Return digit-digit unik dalam urutan acak (pengganti random.shuffle)"""
+        digit_set = set(digits)
+        return [d for d in self.permutation() if d in digit_set]
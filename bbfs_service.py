@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+HTTP service lokal (asyncio) untuk prediksi BBFS dan statistik performa.
+
+Semua response dihitung sekali saat startup ke dalam snapshot immutable,
+sehingga request path hanya berupa lookup tanpa build pola atau backtest.
+
+Endpoints:
+    GET /predict?input=3212&day=kamis[&loss_context=0]
+    GET /streak
+    GET /summary
+    GET /breakdown
+    GET /health
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from urllib.parse import urlsplit, parse_qs
+
+from optimized_bbfs_system import get_system_store, SNAPSHOT_PATH, DAYS
+from ultra_smart_bbfs import DAY_MAP, DAYS as ULTRA_DAYS
+
+# loss_context hanya berpengaruh lewat (> 0), (> 3) dan (+ loss_context) % 10,
+# jadi 0..13 sudah mencakup semua perilaku generate_optimized_bbfs
+LOSS_CONTEXT_SLOTS = 14
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"
+}
+INPUT_PATTERN = re.compile(r"[0-9]{2,}")  # digit ASCII saja (str.isdigit menerima '²', '٣', ...)
+
+
+def _encode(payload):
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def loss_context_slot(loss_context):
+    """Map loss_context ke slot tabel yang memberi BBFS identik"""
+    if loss_context < LOSS_CONTEXT_SLOTS:
+        return max(loss_context, 0)
+    return 4 + (loss_context - 4) % 10
+
+
+@dataclass(frozen=True)
+class ServiceSnapshot:
+    """Snapshot immutable berisi semua response yang sudah di-encode"""
+    predictions: MappingProxyType
+    day_aliases: MappingProxyType
+    streak_body: bytes
+    summary_body: bytes  # None = performance data belum tersedia
+    breakdown_body: bytes
+    health_body: bytes
+    info: dict = field(default_factory=dict)
+
+    def predict_body(self, input_value, day_name, loss_context=0):
+        """Return body JSON untuk satu prediksi, atau None jika input invalid"""
+        input_value = input_value.strip()
+        day = self.day_aliases.get(day_name.strip().lower())
+        if not INPUT_PATTERN.fullmatch(input_value) or day is None:
+            return None
+        return self.predictions.get((loss_context_slot(loss_context), day, input_value[-2:]))
+
+
+def build_snapshot(system):
+    """Bangun ServiceSnapshot dari system yang datanya sudah dimuat (dipanggil sekali di startup)"""
+    if not system.optimization_cache:
+        system.build_optimization_patterns()
+    system.run_performance_test()
+
+    predictions = {}
+    for slot in range(LOSS_CONTEXT_SLOTS):
+        table = system.build_prediction_table(slot)
+        for (day, input_2d), bbfs in table.items():
+            predictions[(slot, day, input_2d)] = _encode({
+                'input_2d': input_2d,
+                'day': day,
+                'bbfs': ''.join(bbfs),
+                'digits': bbfs
+            })
+
+    day_aliases = {alias: DAYS[ULTRA_DAYS.index(day)] for alias, day in DAY_MAP.items()}
+
+    current_streak, streak_details = system.get_current_loss_streak_analysis()
+    data_info = system.get_data_info()
+    summary = system.get_performance_summary()
+
+    return ServiceSnapshot(
+        predictions=MappingProxyType(predictions),
+        day_aliases=MappingProxyType(day_aliases),
+        streak_body=_encode({'current_streak': current_streak, 'details': streak_details}),
+        summary_body=_encode(summary) if summary else None,
+        breakdown_body=_encode(system.get_consecutive_loss_breakdown()),
+        health_body=_encode({'status': 'ok', 'data': data_info}),
+        info=data_info or {}
+    )
+
+
+class BBFSService:
+    """HTTP/1.1 server minimal (keep-alive) di atas asyncio streams"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def route(self, method, target):
+        """Return (status, body) untuk satu request"""
+        if method != "GET":
+            return 405, _encode({'error': 'method not allowed'})
+
+        parts = urlsplit(target)
+        snapshot = self.snapshot
+        path = parts.path.rstrip("/") or "/"
+
+        if path == "/predict":
+            query = parse_qs(parts.query)
+            try:
+                loss_context = int(query.get('loss_context', ['0'])[0])
+            except ValueError:
+                return 400, _encode({'error': 'loss_context harus integer'})
+            body = snapshot.predict_body(query.get('input', [''])[0], query.get('day', [''])[0], loss_context)
+            if body is None:
+                return 400, _encode({'error': 'input (>=2 digit) dan day wajib valid'})
+            return 200, body
+        if path == "/streak":
+            return 200, snapshot.streak_body
+        if path == "/summary":
+            if snapshot.summary_body is None:
+                return 503, _encode({'error': 'performance data belum tersedia'})
+            return 200, snapshot.summary_body
+        if path == "/breakdown":
+            return 200, snapshot.breakdown_body
+        if path in ("/", "/health"):
+            return 200, snapshot.health_body
+        return 404, _encode({'error': 'not found'})
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                keep_alive = version == "HTTP/1.1"
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "connection":
+                        keep_alive = value.strip().lower() == "keep-alive"
+
+                status, body = self.route(method, target)
+                writer.write(
+                    b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n"
+                    b"Connection: %s\r\n\r\n" % (
+                        status, STATUS_TEXT[status].encode(), len(body),
+                        b"keep-alive" if keep_alive else b"close"
+                    ) + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def serve(self, host="127.0.0.1", port=8600):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        print(f"✓ BBFS service aktif di http://{host}:{port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def load_system(snapshot_path=SNAPSHOT_PATH):
+    """Load singleton system dari snapshot lokal, fallback ke fetch network"""
+    store = get_system_store()
+    published, system = store.update(
+        lambda draft: os.path.exists(snapshot_path) and draft.load_snapshot(snapshot_path)
+    )
+    if published:
+        return system
+    published, system = store.update(lambda draft: draft.fetch_complete_data())
+    if not published:
+        raise RuntimeError("Gagal memuat data")
+    system.save_snapshot(snapshot_path)
+    return system
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BBFS prediction HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="Path snapshot data lokal")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        snapshot = build_snapshot(load_system(args.snapshot))
+
+    try:
+        asyncio.run(BBFSService(snapshot).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
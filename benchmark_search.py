@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark pencarian strategi UltraSmartBBFS pada snapshot data lokal.
+
+Mengukur waktu deep_pattern_analysis, biaya per panggilan setiap strategi,
+dan total waktu intensive_search (output progress disembunyikan).
+
+Contoh:
+    python benchmark_search.py --snapshot bbfs_snapshot.json --iterations 10
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from optimized_bbfs_system import SNAPSHOT_PATH
+from result_cache import ResultCache
+from ultra_smart_bbfs import UltraSmartBBFS
+
+STRATEGY_TYPES = ["ultra", "defensive", "aggressive", "balanced"]
+
+
+def _timed(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+
+def bench_strategies(system, rounds=3):
+    """Return {strategy: mikrodetik per panggilan generate_smart_bbfs}"""
+    inputs = [(item['last_2d'], item['day']) for item in system.data[:-1]]
+    timings = {}
+    for strategy_type in STRATEGY_TYPES:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for input_2d, day in inputs:
+                system.generate_smart_bbfs(input_2d, day, strategy_type)
+        elapsed = time.perf_counter() - start
+        timings[strategy_type] = elapsed / (rounds * len(inputs)) * 1e6
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark UltraSmartBBFS intensive_search")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="Path snapshot data lokal")
+    parser.add_argument("--iterations", type=int, default=5, help="max_iterations untuk intensive_search")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default=None, help="File result cache (default: tanpa cache)")
+    args = parser.parse_args(argv)
+
+    system = UltraSmartBBFS(seed=args.seed)
+    if not system.load_snapshot(args.snapshot):
+        raise SystemExit(f"Gagal memuat snapshot {args.snapshot}")
+
+    _, analysis_time = _timed(system.deep_pattern_analysis)
+    print(f"Records: {len(system.data):,}")
+    print(f"deep_pattern_analysis: {analysis_time * 1000:.1f} ms")
+
+    print("\nBiaya per prediksi:")
+    for strategy_type, micros in bench_strategies(system).items():
+        print(f"  {strategy_type:10s} {micros:6.2f} µs")
+
+    cache = ResultCache(args.cache) if args.cache else None
+    best, search_time = _timed(system.intensive_search, max_iterations=args.iterations, cache=cache)
+    evaluations = args.iterations * len(STRATEGY_TYPES)
+    print(f"\nintensive_search({args.iterations}): {search_time:.2f} s "
+          f"(≤{evaluations} evaluasi, {search_time / evaluations * 1000:.1f} ms/evaluasi maks)")
+    if cache is not None:
+        print(f"Result cache: {cache.stats['hits']} hit, {cache.stats['misses']} miss, {cache.stats['loaded']} entry dari disk")
+    if best:
+        print(f"Best: {best['strategy_name']} | max loss {best['max_consecutive_losses']} | win {best['win_rate']}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Block bootstrap untuk confidence interval metrik backtest.
+
+Resample berupa array index (moving block, sirkular) atas vektor win/loss
+backtest; blok menjaga ketergantungan antar draw (loss context) sehingga
+streak tidak dipecah seperti pada bootstrap per draw. Semua resample
+dievaluasi sekaligus dengan run-length vektor NumPy: win rate, max streak
+dan histogram loss streak per resample, lalu interval percentil.
+"""
+
+import numpy as np
+
+
+def run_lengths(losses):
+    """Panjang loss streak aktif di setiap posisi, untuk matrix bool (B, N)"""
+    count = np.cumsum(losses, axis=1, dtype=np.int32)
+    # cumsum pada win terakhir sebelum/di posisi t -> streak = selisihnya
+    reset = np.maximum.accumulate(np.where(losses, 0, count), axis=1)
+    return count - reset
+
+
+def block_bootstrap(wins, n_resamples=2000, block_length=None, confidence=0.95, seed=0, chunk=500):
+    """Interval confidence win rate, max streak dan histogram loss streak.
+
+    wins: vektor win/loss backtest (bool / 0-1), kronologis
+    block_length: panjang blok (default ~N^(1/3))
+    Return dict: win_rate/max_streak -> {value, low, high}, streak_histogram ->
+    {panjang: {value, low, high}} (jumlah streak, termasuk streak terbuka di akhir).
+    """
+    wins = np.asarray(wins, dtype=bool)
+    n = len(wins)
+    if n == 0:
+        return None
+    block_length = block_length or max(1, int(round(n ** (1 / 3))))
+    n_blocks = -(-n // block_length)
+    alpha = (1 - confidence) / 2 * 100
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(block_length)
+
+    observed_run = run_lengths(~wins[None])[0]
+    max_len = max(int(observed_run.max()), 1)
+    win_rates, max_streaks, histograms = [], [], []
+    for lo in range(0, n_resamples, chunk):
+        size = min(chunk, n_resamples - lo)
+        starts = rng.integers(0, n, (size, n_blocks, 1))
+        index = ((starts + offsets) % n).reshape(size, -1)[:, :n]
+        losses = ~wins[index]
+
+        runs = run_lengths(losses)
+        max_streak = runs.max(axis=1)
+        # Streak berakhir di posisi loss yang diikuti win (atau akhir resample)
+        ends = losses & np.concatenate([~losses[:, 1:], np.ones((size, 1), dtype=bool)], axis=1)
+        rows, cols = np.nonzero(ends)
+        lengths = np.minimum(runs[rows, cols], max_len + 1)  # streak > observed max digabung
+
+        win_rates.append(100 - losses.mean(axis=1) * 100)
+        max_streaks.append(max_streak)
+        histograms.append(np.bincount(rows * (max_len + 2) + lengths, minlength=size * (max_len + 2))
+                          .reshape(size, max_len + 2))
+
+    win_rates = np.concatenate(win_rates)
+    max_streaks = np.concatenate(max_streaks)
+    histograms = np.concatenate(histograms)
+
+    def interval(samples, value, digits=1):
+        low, high = np.percentile(samples, [alpha, 100 - alpha])
+        return {'value': value, 'low': round(float(low), digits), 'high': round(float(high), digits)}
+
+    observed_ends = ~wins & np.append(wins[1:], True)
+    observed_hist = np.bincount(observed_run[observed_ends], minlength=max_len + 1)
+    return {
+        'n_resamples': n_resamples,
+        'block_length': block_length,
+        'confidence': confidence,
+        'win_rate': interval(win_rates, round(float(wins.mean() * 100), 1)),
+        'max_streak': interval(max_streaks, int(observed_run.max()), digits=0),
+        'streak_histogram': {
+            length: interval(histograms[:, length], int(observed_hist[length]), digits=0)
+            for length in range(1, max_len + 1)
+        }
+    }
@@ -0,0 +1,130 @@
+"""
+Chart Plotly dari ledger backtest (streak tracker) dengan downsampling.
+
+Seri per transisi dipangkas ke jumlah titik yang dibatasi lebar chart
+(max_points), berapapun panjang history:
+- rolling win rate: LTTB (Largest-Triangle-Three-Buckets), bentuk kurva terjaga
+- streak timeline: min/max per bin, puncak streak tidak pernah hilang
+- per hari: agregat 7 bar (tanpa downsampling)
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from bootstrap_ci import run_lengths
+from optimized_bbfs_system import DAY_INDEX, DAYS
+
+MAX_POINTS = 800       # ~ lebar chart dalam pixel
+ROLLING_WINDOW = 100
+
+
+def lttb_indices(x, y, n_out):
+    """Index titik terpilih LTTB (titik pertama dan terakhir selalu ikut)"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 bucket di antara ujung
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Titik rata-rata bucket berikutnya (atau titik terakhir)
+        nlo, nhi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[prev] - avg_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y - y[prev]))
+        prev = lo + int(area.argmax())
+        selected[b + 1] = prev
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Index min dan max setiap bin (2 titik per bin), urut kronologis"""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    n_bins = max(n_out // 2, 1)
+    edges = np.linspace(0, n, n_bins + 1).astype(np.int64)
+    width = int(np.diff(edges).max())
+    # Bin sama lebar lewat padding: (n_bins, width), padding tidak pernah terpilih
+    index = np.minimum(edges[:-1, None] + np.arange(width), n - 1)
+    valid = edges[:-1, None] + np.arange(width) < edges[1:, None]
+    values = y[index]
+    lows = index[np.arange(n_bins), np.where(valid, values, np.inf).argmin(axis=1)]
+    highs = index[np.arange(n_bins), np.where(valid, values, -np.inf).argmax(axis=1)]
+    return np.unique(np.concatenate([lows, highs]))
+
+
+def ledger_series(system, max_points=MAX_POINTS, window=ROLLING_WINDOW):
+    """Seri chart (sudah di-downsample) dari ledger streak tracker system"""
+    tracker = system.streak_tracker
+    n = tracker.total_tests
+    if not n:
+        return None
+    wins = np.frombuffer(bytes(tracker.outcomes), dtype=np.uint8).astype(bool)
+    positions = np.asarray(tracker.positions, dtype=np.int64)
+    data = system.data
+    dates = np.array([data[i + 1]['date'] for i in positions.tolist()], dtype='datetime64[D]')
+    days = np.array([DAY_INDEX[data[i + 1]['day']] for i in positions.tolist()], dtype=np.int64)
+
+    # Rolling win rate (jendela window transisi, awal history memakai jendela yang ada)
+    cumulative = np.concatenate([[0], np.cumsum(wins)])
+    ends = np.arange(1, n + 1)
+    starts = np.maximum(ends - window, 0)
+    rolling = (cumulative[ends] - cumulative[starts]) / (ends - starts) * 100
+    rolling_idx = lttb_indices(ends.astype(np.float64), rolling, max_points)
+
+    streak = run_lengths(~wins[None])[0]
+    streak_idx = minmax_indices(streak, max_points)
+
+    tests = np.bincount(days, minlength=7)
+    day_wins = np.bincount(days, weights=wins, minlength=7)
+    day_max = np.zeros(7, dtype=np.int64)
+    np.maximum.at(day_max, days, streak)
+
+    return {
+        'points': n,
+        'window': window,
+        'rolling': {'dates': dates[rolling_idx], 'win_rate': np.round(rolling[rolling_idx], 2)},
+        'streak': {'dates': dates[streak_idx], 'streak': streak[streak_idx]},
+        'weekday': {
+            'days': [day.capitalize() for day in DAYS],
+            'tests': tests,
+            'win_rate': np.round(np.divide(day_wins * 100, tests, out=np.zeros(7), where=tests > 0), 1),
+            'max_streak': day_max
+        }
+    }
+
+
+def _layout(figure, title, y_title):
+    figure.update_layout(
+        title=title, height=320, margin=dict(l=40, r=20, t=50, b=40),
+        template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        yaxis_title=y_title, showlegend=False
+    )
+    return figure
+
+
+def build_figures(series):
+    """Figure Plotly (rolling win rate, streak timeline, per hari) dari ledger_series"""
+    rolling, streak, weekday = series['rolling'], series['streak'], series['weekday']
+
+    rolling_fig = go.Figure(go.Scatter(
+        x=rolling['dates'], y=rolling['win_rate'], mode='lines', line=dict(color='#00d2d3', width=2)
+    ))
+    _layout(rolling_fig, f"Rolling Win Rate ({series['window']} draw)", "Win rate (%)")
+
+    streak_fig = go.Figure(go.Scatter(
+        x=streak['dates'], y=streak['streak'], mode='lines', line=dict(color='#ff6b6b', width=1.5, shape='hv'),
+        fill='tozeroy'
+    ))
+    _layout(streak_fig, "Timeline Loss Streak", "Loss beruntun")
+
+    weekday_fig = go.Figure(go.Bar(
+        x=weekday['days'], y=weekday['win_rate'], marker_color='#54a0ff',
+        customdata=np.stack([weekday['tests'], weekday['max_streak']], axis=1),
+        hovertemplate="%{x}<br>Win %{y:.1f}%<br>Test %{customdata[0]}<br>Max loss %{customdata[1]}<extra></extra>"
+    ))
+    _layout(weekday_fig, "Performa per Hari", "Win rate (%)")
+
+    return {'rolling': rolling_fig, 'streak': streak_fig, 'weekday': weekday_fig}
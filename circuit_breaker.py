@@ -0,0 +1,65 @@
+"""
+Circuit breaker untuk request ke sumber data.
+
+closed    -> request normal; gagal beruntun >= failure_threshold -> open
+open      -> request langsung ditolak (tanpa timeout) selama reset_timeout
+half_open -> satu probe diizinkan; sukses -> closed, gagal -> open lagi
+"""
+
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """State breaker thread-safe (dipakai bersama fetcher app dan watcher)"""
+
+    def __init__(self, failure_threshold=3, reset_timeout=300, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+
+    def allow_request(self):
+        """True jika request boleh dikirim; di half_open hanya satu probe"""
+        with self.lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                return True
+            if self.state == CLOSED:
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+    def status(self):
+        """Ringkasan state untuk UI / health check"""
+        with self.lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'retry_in': retry_in
+            }
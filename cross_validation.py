@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Rolling-origin cross-validation untuk OptimizedBBFSSystem.
+
+History dibagi menjadi K fold berurutan: fold f membangun pola dari prefix
+data[:train_end_f] lalu dievaluasi pada blok berikutnya. Pola dibangun
+sekali secara incremental (extend_optimization_patterns) dan state-nya
+di-snapshot per fold; evaluasi fold berjalan paralel di beberapa proses.
+
+Contoh:
+    python cross_validation.py --snapshot bbfs_snapshot.json --folds 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import pickle
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from optimized_bbfs_system import OptimizedBBFSSystem, SNAPSHOT_PATH
+
+
+def rolling_origin_splits(n_records, folds, min_train):
+    """Return list (train_end, test_end): fold f dilatih pada data[:train_end]
+    dan memprediksi draw data[train_end:test_end]"""
+    if folds < 1:
+        raise ValueError("folds harus >= 1")
+    block = (n_records - min_train) // folds
+    if min_train < 2 or block < 1:
+        raise ValueError(f"Data tidak cukup: {n_records} records untuk {folds} fold dengan min_train {min_train}")
+    return [(min_train + f * block, min_train + (f + 1) * block) for f in range(folds)]
+
+
+def _evaluate_fold(job):
+    """Worker: evaluasi satu fold dengan pola hasil snapshot (module-level agar picklable)"""
+    fold, train_end, records, cache_blob = job
+    system = OptimizedBBFSSystem()
+    system.data = records
+    system.optimization_cache = pickle.loads(cache_blob)
+
+    stats = system.backtest_range(0, len(records) - 1)
+    loss_streaks = stats['loss_streaks']
+    if stats['consecutive_losses'] > 0:
+        loss_streaks.append(stats['consecutive_losses'])
+
+    return {
+        'fold': fold,
+        'train_size': train_end,
+        'total_tests': stats['total_tests'],
+        'total_wins': stats['total_wins'],
+        'win_rate': stats['total_wins'] / stats['total_tests'] * 100 if stats['total_tests'] else 0,
+        'max_consecutive_loss': stats['max_consecutive_loss'],
+        'loss_streaks': loss_streaks
+    }
+
+
+def run_cross_validation(system, folds=5, min_train=None, workers=None):
+    """Jalankan rolling-origin CV; return dict per-fold dan agregat"""
+    n = len(system.data)
+    if min_train is None:
+        min_train = n // 2
+    splits = rolling_origin_splits(n, folds, min_train)
+
+    # Pola dibangun incremental: fold berikutnya hanya menambah transisi baru
+    trainer = OptimizedBBFSSystem()
+    trainer.data = system.data
+    trainer.decay_half_lives = system.decay_half_lives
+    with contextlib.redirect_stdout(io.StringIO()):
+        trainer.build_optimization_patterns(end=0)
+
+    jobs = []
+    for fold, (train_end, test_end) in enumerate(splits, 1):
+        trainer.extend_optimization_patterns(train_end)
+        # Input pertama = draw terakhir training, target = data[train_end:test_end]
+        records = system.data[train_end - 1:test_end]
+        jobs.append((fold, train_end, records, pickle.dumps(trainer.optimization_cache)))
+
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fold_results = list(pool.map(_evaluate_fold, jobs))
+    else:
+        fold_results = [_evaluate_fold(job) for job in jobs]
+
+    total_tests = sum(r['total_tests'] for r in fold_results)
+    total_wins = sum(r['total_wins'] for r in fold_results)
+    win_rates = [r['win_rate'] for r in fold_results]
+    max_streaks = [r['max_consecutive_loss'] for r in fold_results]
+
+    return {
+        'folds': fold_results,
+        'aggregate': {
+            'folds': len(fold_results),
+            'min_train': min_train,
+            'total_tests': total_tests,
+            'total_wins': total_wins,
+            'win_rate': round(total_wins / total_tests * 100, 1) if total_tests else 0,
+            'win_rate_mean': round(statistics.mean(win_rates), 1),
+            'win_rate_std': round(statistics.pstdev(win_rates), 1),
+            'max_consecutive_loss': max(max_streaks),
+            'max_consecutive_loss_mean': round(statistics.mean(max_streaks), 1)
+        }
+    }
+
+
+def print_report(result):
+    print(f"{'Fold':>4} | {'Train':>6} | {'Tests':>5} | {'Win Rate':>8} | {'Max Loss':>8}")
+    print("-" * 46)
+    for r in result['folds']:
+        print(f"{r['fold']:4d} | {r['train_size']:6d} | {r['total_tests']:5d} | "
+              f"{r['win_rate']:7.1f}% | {r['max_consecutive_loss']:8d}")
+    agg = result['aggregate']
+    print("-" * 46)
+    print(f"Aggregate: {agg['total_wins']}/{agg['total_tests']} win ({agg['win_rate']}%), "
+          f"per fold {agg['win_rate_mean']}% ± {agg['win_rate_std']}")
+    print(f"Max loss streak: {agg['max_consecutive_loss']} (rata-rata per fold {agg['max_consecutive_loss_mean']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rolling-origin cross-validation BBFS")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="Path snapshot data lokal")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--min-train", type=int, default=None, help="Ukuran training fold pertama (default: setengah data)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    args = parser.parse_args(argv)
+
+    system = OptimizedBBFSSystem()
+    if not system.load_snapshot(args.snapshot):
+        raise SystemExit(f"Gagal memuat snapshot {args.snapshot}")
+    print_report(run_cross_validation(system, args.folds, args.min_train, args.workers))
+
+
+if __name__ == "__main__":
+    main()
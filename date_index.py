@@ -0,0 +1,61 @@
+"""
+Index tanggal (ordinal int32 terurut, bisect via np.searchsorted) untuk
+range query O(log N + k) atas data yang sudah di-sort ascending.
+
+Query mengembalikan posisi (index ke self.data), bukan salinan record,
+sehingga caller bisa iterasi range tanpa menyalin data.
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+
+
+def to_ordinal(value):
+    """datetime/date/'YYYY-MM-DD' -> ordinal hari"""
+    if isinstance(value, str):
+        value = datetime.strptime(value, '%Y-%m-%d')
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.toordinal()
+    return int(value)
+
+
+class DateIndex:
+    """Posisi record berdasarkan tanggal, plus posisi per hari (weekday)"""
+
+    def __init__(self, records, day_index):
+        self.ordinals = np.fromiter(
+            (item['date'].toordinal() for item in records), dtype=np.int32, count=len(records)
+        )
+        days = np.fromiter(
+            (day_index.get(item['day'], 0) for item in records), dtype=np.int8, count=len(records)
+        )
+        self.day_index = day_index
+        self.weekday_positions = [np.flatnonzero(days == w).astype(np.int32) for w in range(7)]
+        self.weekday_ordinals = [self.ordinals[pos] for pos in self.weekday_positions]
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def bounds(self, start=None, end=None):
+        """Return (lo, hi): posisi record dengan start <= tanggal <= end (inklusif)"""
+        lo = 0 if start is None else int(np.searchsorted(self.ordinals, to_ordinal(start), 'left'))
+        hi = len(self.ordinals) if end is None else int(np.searchsorted(self.ordinals, to_ordinal(end), 'right'))
+        return lo, max(lo, hi)
+
+    def last_days(self, n_days):
+        """Return (lo, hi) untuk n hari kalender terakhir (relatif ke tanggal terbaru)"""
+        if not len(self.ordinals):
+            return 0, 0
+        first = int(self.ordinals[-1]) - n_days + 1
+        return int(np.searchsorted(self.ordinals, first, 'left')), len(self.ordinals)
+
+    def weekday(self, weekday, start=None, end=None):
+        """Posisi semua record pada hari tertentu (nama hari atau 0..6) dalam range"""
+        w = self.day_index[weekday] if isinstance(weekday, str) else weekday
+        ordinals = self.weekday_ordinals[w]
+        lo = 0 if start is None else int(np.searchsorted(ordinals, to_ordinal(start), 'left'))
+        hi = len(ordinals) if end is None else int(np.searchsorted(ordinals, to_ordinal(end), 'right'))
+        return self.weekday_positions[w][lo:hi]
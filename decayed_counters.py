@@ -0,0 +1,61 @@
+"""
+Counter frekuensi dengan exponential decay (recency weighting) per draw.
+
+Memakai scaled-counter trick: alih-alih mengalikan semua count dengan
+faktor decay setiap draw, bobot event baru yang diperbesar (scale *= 2^(1/h)).
+Nilai decayed = stored / scale. Update O(1) per draw; renormalisasi penuh
+hanya terjadi saat scale mendekati overflow (sangat jarang).
+
+Beberapa half-life disimpan berdampingan dalam satu array (H, ...), sehingga
+update untuk semua half-life cukup satu operasi vektor kecil.
+"""
+
+import numpy as np
+
+_RENORMALIZE_AT = 1e200
+
+
+class DecayedFrequencyBank:
+    """Decayed digit counts (10,) dan transisi digit-setelah-input (100, 10)
+    untuk beberapa half-life (dalam satuan draw) sekaligus."""
+
+    def __init__(self, half_lives=(30, 90, 365)):
+        self.half_lives = tuple(half_lives)
+        if not self.half_lives or min(self.half_lives) <= 0:
+            raise ValueError("half_lives harus berisi nilai > 0")
+        self.index = {h: i for i, h in enumerate(self.half_lives)}
+        self.growth = 2.0 ** (1.0 / np.asarray(self.half_lives, dtype=np.float64))
+        self.scale = np.ones(len(self.half_lives))
+        self.digit_counts = np.zeros((len(self.half_lives), 10))
+        self.transition_counts = np.zeros((len(self.half_lives), 100, 10))
+        self.draws = 0
+
+    def update(self, input_2d, next_2d):
+        """Catat satu transisi input_2d -> next_2d sebagai draw terbaru"""
+        if self.draws:
+            self.scale *= self.growth
+            if self.scale.max() > _RENORMALIZE_AT:
+                self._renormalize()
+
+        row = int(input_2d)
+        scale = self.scale
+        for digit in next_2d:
+            d = ord(digit) - 48
+            self.digit_counts[:, d] += scale
+            self.transition_counts[:, row, d] += scale
+        self.draws += 1
+
+    def _renormalize(self):
+        self.digit_counts /= self.scale[:, None]
+        self.transition_counts /= self.scale[:, None, None]
+        self.scale = np.ones_like(self.scale)
+
+    def digits(self, half_life):
+        """Decayed digit counts (10,) untuk satu half-life"""
+        i = self.index[half_life]
+        return self.digit_counts[i] / self.scale[i]
+
+    def transitions(self, half_life, input_2d):
+        """Decayed count digit setelah input_2d (10,) untuk satu half-life"""
+        i = self.index[half_life]
+        return self.transition_counts[i, int(input_2d)] / self.scale[i]
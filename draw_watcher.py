@@ -0,0 +1,176 @@
+"""
+Watcher server-side untuk draw baru: satu thread poller per proses.
+
+Poll memakai conditional request (If-None-Match / If-Modified-Since) dan
+sha1 content, sehingga respons yang tidak berubah tidak di-parse ulang.
+Interval adaptif: rapat (min_interval) di sekitar jam draw yang diharapkan
+- dikonfigurasi atau dipelajari dari jam perubahan yang pernah terlihat -
+dan backoff eksponensial sampai max_interval di luar jendela itu.
+
+Draw baru di-ingest ke clone snapshot lalu dipublish lewat SnapshotStore;
+session (Streamlit fragment) cukup membaca store.current, tanpa request ke
+sumber per session.
+
+Watcher menghormati circuit breaker system: saat breaker open poll dilewati
+tanpa network, dan poll pertama setelah reset_timeout menjadi probe
+background yang menutup breaker kembali jika sumber sudah pulih.
+"""
+
+import hashlib
+import threading
+from datetime import datetime
+
+from optimized_bbfs_system import REQUEST_HEADERS
+
+THROTTLED = 'throttled'  # poll_now: poll terakhir terlalu baru, tidak ada request ke sumber
+
+
+def _minute_of_day(value):
+    """'HH:MM' / (jam, menit) / datetime -> menit sejak 00:00"""
+    if isinstance(value, str):
+        hour, minute = value.split(':')
+        return int(hour) * 60 + int(minute)
+    if isinstance(value, datetime):
+        return value.hour * 60 + value.minute
+    return int(value[0]) * 60 + int(value[1])
+
+
+class DrawWatcher:
+    """Poll sumber data untuk SnapshotStore berisi OptimizedBBFSSystem"""
+
+    def __init__(self, store, draw_times=(), min_interval=30, max_interval=900,
+                 window_minutes=20, timeout=30, min_refresh_interval=10):
+        self.store = store
+        self.draw_minutes = {_minute_of_day(t) for t in draw_times}
+        self.learned_minutes = set()  # jam perubahan yang teramati
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.window_minutes = window_minutes
+        self.timeout = timeout
+        self.min_refresh_interval = min_refresh_interval  # throttle poll manual beruntun
+
+        self.version = 0              # naik setiap ada draw baru
+        self.interval = min_interval
+        self.etag = None
+        self.last_modified = None
+        self.stats = {
+            'polls': 0, 'skipped': 0, 'not_modified': 0, 'unchanged': 0,
+            'updates': 0, 'errors': 0, 'last_poll': None, 'last_change': None
+        }
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Jalankan thread poller (idempotent)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="draw-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            changed = self.poll()
+            self._stop.wait(self.next_delay(changed))
+
+    def in_draw_window(self, now=None):
+        """True jika sekarang dekat jam draw (dikonfigurasi atau dipelajari)"""
+        minute = _minute_of_day(now or datetime.now())
+        for target in self.draw_minutes | self.learned_minutes:
+            distance = abs(minute - target)
+            if min(distance, 1440 - distance) <= self.window_minutes:
+                return True
+        return False
+
+    def next_delay(self, changed, now=None):
+        """Interval poll berikutnya: rapat di jendela draw, backoff di luar"""
+        if changed or self.in_draw_window(now):
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        return self.interval
+
+    def poll(self):
+        """Poll lewat single-flight store: poll background dan tombol refresh dari
+        banyak session yang bersamaan hanya mengirim satu request ke sumber"""
+        return self.store.flight.run('source_poll', self._poll, self.min_refresh_interval)
+
+    def _poll(self):
+        """Satu conditional request; return True jika ada draw baru yang di-ingest"""
+        import requests  # lazy: start watcher tidak menunda render pertama
+
+        system = self.store.current
+        breaker = system.breaker
+        if not breaker.allow_request():
+            self.stats['skipped'] += 1
+            return False
+        self.stats['polls'] += 1
+        self.stats['last_poll'] = datetime.now()
+        headers = dict(REQUEST_HEADERS)
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        try:
+            response = requests.get(system.url, timeout=self.timeout, headers=headers)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.RequestException as e:
+            breaker.record_failure()
+            self.stats['errors'] += 1
+            print(f"Watcher poll gagal: {e}")
+            return False
+
+        breaker.record_success()
+        if response.status_code == 304:
+            self.stats['not_modified'] += 1
+            self._confirm_fresh(system)
+            return False
+
+        # Validator baru baru disimpan setelah content-nya ada di snapshot: jika
+        # ingest/publish gagal, poll berikutnya harus mengambil content penuh lagi
+        validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        content = response.text
+        if hashlib.sha1(content.encode('utf-8')).hexdigest() == system.source_digest:
+            self.etag, self.last_modified = validators
+            self.stats['unchanged'] += 1
+            self._confirm_fresh(system)
+            return False
+
+        last_draw = system.data[-1]['date'] if system.data else None
+        published, system = self.store.update(lambda draft: draft.ingest_content(content))
+        if not published:
+            self.stats['errors'] += 1
+            return False
+        self.etag, self.last_modified = validators
+        if system.data[-1]['date'] == last_draw:
+            # Content berubah tanpa draw baru (mis. markup halaman)
+            self.stats['unchanged'] += 1
+            return False
+
+        now = datetime.now()
+        self.learned_minutes.add(_minute_of_day(now))
+        self.stats['updates'] += 1
+        self.stats['last_change'] = now
+        self.version += 1
+        return True
+
+    def _confirm_fresh(self, system):
+        """Sumber pulih tanpa perubahan data: publish ulang tanpa flag stale"""
+        if system.is_stale:
+            self.store.update(lambda draft: draft.mark_source_fresh() or True)
+
+    def poll_now(self):
+        """Poll manual (tombol refresh) lewat jalur conditional yang sama.
+        
+        Return True (draw baru), False (tidak ada draw baru) atau THROTTLED
+        jika poll terakhir belum min_refresh_interval detik yang lalu.
+        """
+        changed = self.store.flight.run('source_poll', self._poll, self.min_refresh_interval, THROTTLED)
+        if changed is True:
+            self.interval = self.min_interval
+        return changed
@@ -0,0 +1,90 @@
+"""
+Feature index vektor atas hasil 4D lengkap.
+
+Dibangun sekali saat ingest (load data/snapshot) sebagai array NumPy,
+menggantikan dict fitur per record: digit per posisi, sum, product dan
+jumlah digit genap, plus agregat yang bisa di-query O(1) oleh scorer.
+"""
+
+import numpy as np
+
+N_POSITIONS = 4
+MAX_SUM = 9 * N_POSITIONS
+
+
+class DigitFeatureIndex:
+    """Array fitur (N draw) dan agregat per posisi / per hari"""
+
+    def __init__(self, results, weekdays):
+        n = len(results)
+        if n:
+            joined = "".join(results)
+            if len(joined) != n * N_POSITIONS or not (joined.isascii() and joined.isdigit()):
+                raise ValueError("result harus tepat 4 digit ASCII per draw")
+            raw = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+            self.digits = (raw.reshape(n, N_POSITIONS) - 48).astype(np.int8)
+        else:
+            self.digits = np.zeros((0, N_POSITIONS), dtype=np.int8)
+        self.weekdays = np.asarray(weekdays, dtype=np.int8)
+
+        digits = self.digits.astype(np.int64)
+        self.digit_sum = digits.sum(axis=1)
+        self.digit_product = np.where(digits > 0, digits, 1).prod(axis=1)
+        self.even_count = (digits % 2 == 0).sum(axis=1)
+
+        # Count digit per posisi (4, 10)
+        positions = np.arange(N_POSITIONS)
+        self.position_counts = np.bincount(
+            (positions * 10 + digits).ravel(), minlength=N_POSITIONS * 10
+        ).reshape(N_POSITIONS, 10)
+
+        # Transisi digit per posisi dari draw t ke t+1 (4, 10, 10)
+        self.position_transitions = np.bincount(
+            ((positions * 10 + digits[:-1]) * 10 + digits[1:]).ravel(),
+            minlength=N_POSITIONS * 100
+        ).reshape(N_POSITIONS, 10, 10)
+
+        # Histogram sum (0..36) dan jumlah digit genap (0..4) per hari (7, ...)
+        wd = self.weekdays.astype(np.int64)
+        self.sum_by_weekday = np.bincount(
+            wd * (MAX_SUM + 1) + self.digit_sum, minlength=7 * (MAX_SUM + 1)
+        ).reshape(7, MAX_SUM + 1)
+        self.even_by_weekday = np.bincount(
+            wd * (N_POSITIONS + 1) + self.even_count, minlength=7 * (N_POSITIONS + 1)
+        ).reshape(7, N_POSITIONS + 1)
+
+    @classmethod
+    def from_records(cls, records, day_index):
+        """Build dari list record engine; day_index: nama hari -> 0..6"""
+        return cls(
+            [item['result'] for item in records],
+            [day_index.get(item['day'], 0) for item in records]
+        )
+
+    def __len__(self):
+        return len(self.digits)
+
+    def position_frequency(self, position):
+        """Count digit 0-9 di posisi (0 = digit pertama 4D, 3 = terakhir)"""
+        return self.position_counts[position]
+
+    def position_next(self, position, digit):
+        """Count digit di posisi yang sama pada draw berikutnya setelah digit ini"""
+        return self.position_transitions[position, int(digit)]
+
+    def sum_histogram(self, weekday):
+        return self.sum_by_weekday[weekday]
+
+    def parity_histogram(self, weekday):
+        """Histogram jumlah digit genap (0..4) untuk satu hari"""
+        return self.even_by_weekday[weekday]
+
+    def record_features(self, i):
+        """Fitur satu draw sebagai dict (on demand, format lama UltraSmartBBFS)"""
+        return {
+            'digits': self.digits[i].tolist(),
+            'digit_sum': int(self.digit_sum[i]),
+            'digit_product': int(self.digit_product[i]),
+            'even_count': int(self.even_count[i]),
+            'odd_count': N_POSITIONS - int(self.even_count[i])
+        }
@@ -0,0 +1,138 @@
+"""
+Akuntansi memori per refresh untuk OptimizedBBFSSystem.
+
+Setiap snapshot yang dipublish store dicatat: deep size komponen besar
+(data, optimization_cache, performance_data, streak_tracker), memori yang
+di-trace tracemalloc, RSS proses, dan diff alokasi tracemalloc terhadap
+refresh sebelumnya (top baris kode yang bertambah). Komponen yang terus
+tumbuh antar refresh langsung terlihat sebagai delta; riwayat laporan bisa
+diekspor sebagai JSON.
+"""
+
+import json
+import os
+import sys
+import threading
+import tracemalloc
+import types
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+COMPONENTS = ('data', 'optimization_cache', 'performance_data', 'streak_tracker')
+_ATOMIC = (str, bytes, int, float, bool, complex, type(None), datetime)
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType)
+
+
+def deep_size(obj, seen=None):
+    """Ukuran rekursif (byte) obj; objek yang dibagi hanya dihitung sekali per `seen`"""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, _ATOMIC) or isinstance(item, _OPAQUE):
+            continue
+        if isinstance(item, np.ndarray):
+            if item.base is not None:
+                stack.append(item.base)
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, '__dict__'):
+            # Instance biasa (mis. DecayedFrequencyBank, LossStreakTracker)
+            stack.append(vars(item))
+    return total
+
+
+def _rss_bytes():
+    """RSS proses saat ini (Linux /proc), atau None jika tidak tersedia"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryMonitor:
+    """Riwayat laporan memori per refresh + diff tracemalloc antar refresh"""
+
+    def __init__(self, trace=True, top=10, history=50):
+        self.top = top
+        self.reports = deque(maxlen=history)
+        self.lock = threading.Lock()
+        self.previous = None  # snapshot tracemalloc refresh terakhir
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _allocation_diff(self):
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        previous, self.previous = self.previous, snapshot
+        if previous is None:
+            return []
+        return [
+            {
+                'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                'size_diff': stat.size_diff,
+                'count_diff': stat.count_diff,
+                'size': stat.size
+            }
+            for stat in snapshot.compare_to(previous, 'lineno')[:self.top]
+            if stat.size_diff
+        ]
+
+    def record(self, system, label='refresh'):
+        """Catat satu laporan untuk snapshot system (dipanggil setiap publish)"""
+        with self.lock:
+            # Diff tracemalloc lebih dulu, sebelum deep_size mengalokasikan set sementara
+            top_allocations = self._allocation_diff()
+            traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (None, None)
+            seen = set()
+            components = {name: deep_size(getattr(system, name, None), seen) for name in COMPONENTS}
+            report = {
+                'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'label': label,
+                'records': len(system.data),
+                'components': components,
+                'total': sum(components.values()),
+                'traced': traced,
+                'traced_peak': peak,
+                'rss': _rss_bytes(),
+                'top_allocations': top_allocations
+            }
+            last = self.reports[-1] if self.reports else None
+            report['deltas'] = {
+                key: (report[key] - last[key]) if last and report[key] is not None and last[key] is not None else None
+                for key in ('total', 'traced', 'rss')
+            }
+            report['component_deltas'] = {
+                name: size - last['components'][name] if last else None for name, size in components.items()
+            }
+            self.reports.append(report)
+            return report
+
+    def latest(self):
+        return self.reports[-1] if self.reports else None
+
+    def export(self, path=None):
+        """Riwayat laporan sebagai JSON (string); ditulis ke path jika diisi"""
+        with self.lock:
+            payload = json.dumps(list(self.reports), indent=2)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+        return payload
@@ -0,0 +1,90 @@
+"""
+Kernel backtest multi-strategi dalam satu pass atas history.
+
+Konteks per step (input 2D, hari, kandidat, ...) dan bitmask 2D target
+dihitung sekali lalu dibagi S strategi. Setiap step menghasilkan vektor
+(S,) bitmask BBFS; win, streak aktif, max streak dan total win untuk semua
+strategi di-update dengan operasi vektor NumPy, sehingga strategi tambahan
+hanya menambah biaya generate BBFS-nya sendiri.
+
+Strategi menerima loss context miliknya (streak aktif strategi itu), jadi
+varian OptimizedBBFSSystem yang memakai loss context juga bisa dibatch.
+"""
+
+import numpy as np
+
+DIGIT_BITS = {str(d): 1 << d for d in range(10)}
+MASK_2D = {f"{n:02d}": (1 << (n // 10)) | (1 << (n % 10)) for n in range(100)}
+
+
+def digits_mask(digits):
+    """List digit BBFS -> bitmask 10 bit"""
+    mask = 0
+    for digit in digits:
+        mask |= DIGIT_BITS[digit]
+    return mask
+
+
+def multi_strategy_backtest(contexts, targets, strategies, max_allowed_losses=None, min_tests=200):
+    """Backtest S strategi sekaligus.
+
+    contexts: konteks per step (sequence, dihitung sekali untuk semua strategi)
+    targets: bitmask 2D hasil berikutnya per step (T,)
+    strategies: list callable f(context, loss_context) -> digit BBFS
+    max_allowed_losses: jika diisi, strategi berhenti seperti test_strategy_rigorously
+        (max streak > batas pada step > min_tests); strategi lain tetap jalan
+
+    Return dict array: win/bbfs_mask/streak (T, S), size/wins/max_streak (S,)
+    """
+    targets = np.asarray(targets, dtype=np.uint16)
+    n_steps, n_strategies = len(targets), len(strategies)
+
+    win = np.zeros((n_steps, n_strategies), dtype=bool)
+    masks = np.zeros((n_steps, n_strategies), dtype=np.uint16)
+    streaks = np.zeros((n_steps, n_strategies), dtype=np.int32)
+    size = np.zeros(n_strategies, dtype=np.int64)
+    wins = np.zeros(n_strategies, dtype=np.int64)
+    max_streak = np.zeros(n_strategies, dtype=np.int32)
+    streak = np.zeros(n_strategies, dtype=np.int32)
+    alive = np.ones(n_strategies, dtype=bool)
+    active = list(range(n_strategies))
+
+    for t in range(n_steps):
+        context = contexts[t]
+        row = masks[t]
+        losses = streak.tolist()
+        for s in active:
+            row[s] = digits_mask(strategies[s](context, losses[s]))
+
+        # Update S streak state sekaligus (strategi yang sudah berhenti dibekukan)
+        step_win = (targets[t] & ~row) == 0
+        streak = np.where(alive, np.where(step_win, 0, streak + 1), streak)
+        np.maximum(max_streak, streak, out=max_streak)
+        wins += step_win & alive
+        size[alive] = t + 1
+        win[t] = step_win
+        streaks[t] = streak
+
+        if max_allowed_losses is not None and t > min_tests:
+            stopped = alive & (max_streak > max_allowed_losses)
+            if stopped.any():
+                alive &= ~stopped
+                active = [s for s in active if alive[s]]
+                if not active:
+                    break
+
+    return {
+        'win': win,
+        'bbfs_mask': masks,
+        'streak': streaks,
+        'size': size,
+        'wins': wins,
+        'max_streak': max_streak
+    }
+
+
+def loss_streaks(streak_column):
+    """Panjang setiap loss streak (termasuk yang masih terbuka di akhir) dari kolom streak"""
+    streak_column = np.asarray(streak_column)
+    ends = np.flatnonzero((streak_column > 0) & np.append(streak_column[1:] == 0, True))
+    return streak_column[ends].tolist()
@@ -1,80 +1,376 @@
-import requests
 import re
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
+import copy
+import hashlib
+import json
+import os
+import pickle
 import random
 import time
 
+import numpy as np
+
+from bootstrap_ci import block_bootstrap
+from circuit_breaker import CLOSED, CircuitBreaker
+from date_index import DateIndex
+from decayed_counters import DecayedFrequencyBank
+from feature_index import DigitFeatureIndex
+from multi_backtest import MASK_2D, loss_streaks, multi_strategy_backtest
+from streak_baseline import random_bbfs_win_probability, streak_baseline
+from streak_tracker import LossStreakTracker
+from sparse_context import SparseContextIndex
+from system_store import SnapshotStore
+
+# Artefak runtime (tidak di-commit, lihat .gitignore); path bisa diganti lewat env
+SNAPSHOT_PATH = os.environ.get("BBFS_SNAPSHOT_PATH", "bbfs_snapshot.json")
+BUNDLE_PATH = os.environ.get("BBFS_BUNDLE_PATH", "bbfs_bundle.pkl")
+BUNDLE_FORMAT = 3
+RESULT_PATTERN = re.compile(r'[0-9]{4}')  # result 4D: digit ASCII saja
+REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+DEFAULT_MIN_YEAR = 2020
+DAYS = ['senin', 'selasa', 'rabu', 'kamis', 'jumat', 'sabtu', 'minggu']
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+
 class OptimizedBBFSSystem:
-    def __init__(self):
+    def __init__(self, min_year=DEFAULT_MIN_YEAR, max_year=None, min_records=1991):
         self.url = "http://178.128.121.191/"
+        self.min_year = min_year
+        self.max_year = max_year      # None = tanpa batas atas
+        self.min_records = min_records
         self.data = []
+        self.date_index = None
         self.performance_cache = {}
         self.loss_analysis = {}
         self.optimization_cache = {}
+        self.pattern_version = 0      # naik setiap build_optimization_patterns (rebuild penuh)
+        self.performance_data = None
+        self.sparse_context = None
+        self.streak_tracker = LossStreakTracker()
+        self.features = None  # DigitFeatureIndex atas hasil 4D, dibangun saat ingest
+        self.decay_half_lives = (30, 90, 365)  # dalam satuan draw
+        self.source_digest = None     # sha1 content sumber terakhir yang di-ingest
+        self.snapshot_path = SNAPSHOT_PATH  # last good data, dipakai saat sumber down
+        self.snapshot_pending = False # data belum ada di snapshot disk (ditulis setelah publish)
+        self.breaker = CircuitBreaker()
+        self.is_stale = False         # True = data dari memori/snapshot, sumber tidak terjangkau
+        self.source_updated_at = None # waktu terakhir data terkonfirmasi dari sumber
         self.last_updated = None
         
     def fetch_complete_data(self):
-        """Fetch complete data from 2020-2025"""
+        """Fetch complete data dalam range tahun min_year..max_year"""
+        import requests  # lazy: tidak dibayar saat start dari bundle/snapshot
+        
         try:
-            print("Mengambil data lengkap dari 2020-2025...")
-            # Add retry logic for production deployment
+            print(f"Mengambil data lengkap dari {self.min_year}-{self.max_year or 'sekarang'}...")
+            # Retry selama circuit breaker closed; saat open langsung pakai data terakhir
             max_retries = 3
-            content = ""
+            content = None
             for attempt in range(max_retries):
+                if not self.breaker.allow_request():
+                    break
                 try:
-                    response = requests.get(
-                        self.url, 
-                        timeout=30,
-                        headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                    )
+                    response = requests.get(self.url, timeout=30, headers=REQUEST_HEADERS)
                     response.raise_for_status()
+                    self.breaker.record_success()
                     content = response.text
                     break
                 except requests.RequestException as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    print(f"Attempt {attempt + 1} failed, retrying...")
-                    time.sleep(2)
+                    self.breaker.record_failure()
+                    print(f"Attempt {attempt + 1} failed: {e}")
+                    if attempt < max_retries - 1 and self.breaker.state == CLOSED:
+                        time.sleep(2)
             
-            pattern = r'<td title="([^"]*=\d{4}-\d{2}-\d{2}=[^"]*)">(\d{4})</td>'
-            matches = re.findall(pattern, content)
-            
-            data = []
-            for match in matches:
-                title_info = match[0]
-                result = match[1]
-                
-                parts = title_info.split('=')
-                if len(parts) >= 2:
-                    day_name = parts[0]
-                    date_str = parts[1]
-                    
-                    try:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        if 2020 <= date_obj.year <= 2025:
-                            data.append({
-                                'date': date_obj,
-                                'day': self.standardize_day(day_name),
-                                'result': result,
-                                'last_2d': result[-2:],
-                                'all_digits': list(result)
-                            })
-                    except ValueError:
-                        continue
-            
-            # Sort by date ascending
-            data.sort(key=lambda x: x['date'])
-            self.data = data
-            self.last_updated = datetime.now()
-            
-            print(f"✓ Data berhasil dimuat: {len(self.data)} records dari {data[0]['date'].year}-{data[-1]['date'].year}")
-            return len(self.data) >= 1991
+            if content is None:
+                return self.serve_stale()
+            return self.ingest_content(content)
             
         except Exception as e:
             print(f"Error loading data: {e}")
             return False
     
+    def parse_content(self, content):
+        """Parse HTML sumber -> list record (sorted ascending, dalam range tahun)"""
+        # [0-9], bukan \d: \d juga cocok dengan digit Unicode (mis. '٣')
+        pattern = r'<td title="([^"]*=\d{4}-\d{2}-\d{2}=[^"]*)">([0-9]{4})</td>'
+        matches = re.findall(pattern, content)
+        
+        data = []
+        for match in matches:
+            title_info = match[0]
+            result = match[1]
+            
+            parts = title_info.split('=')
+            if len(parts) >= 2:
+                day_name = parts[0]
+                date_str = parts[1]
+                
+                try:
+                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+                    if self.in_year_range(date_obj):
+                        data.append(self._make_record(date_obj, day_name, result))
+                except ValueError:
+                    continue
+        
+        # Sort by date ascending
+        data.sort(key=lambda x: x['date'])
+        return data
+    
+    def ingest_content(self, content):
+        """Ganti data dengan hasil parse content; draw baru hanya memproses suffix"""
+        data = self.parse_content(content)
+        if not data:
+            print("Error loading data: tidak ada hasil yang bisa di-parse")
+            return False
+        
+        digest = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        appended = self._extends_current_data(data)
+        if not appended:
+            # History berubah (bukan hanya draw baru) -> checkpoint backtest tidak valid
+            self.streak_tracker.reset()
+            self.performance_data = None
+        self.data = data
+        self._index_data()
+        if not appended and self.optimization_cache:
+            # Pola dari history lama tidak bisa di-extend: rebuild penuh (versi baru)
+            self.build_optimization_patterns()
+        self.last_updated = datetime.now()
+        self.mark_source_fresh()
+        if digest != self.source_digest:
+            self.source_digest = digest
+            self.snapshot_pending = True
+        if self.optimization_cache:
+            # Draw baru masuk ke pola + decayed counters dulu (copy: pola snapshot
+            # yang dipublish dibagi dengan reader), lalu hanya draw baru yang
+            # dievaluasi (checkpoint tracker + performance_data)
+            if self.optimization_cache['built_until'] < len(self.data):
+                self.optimization_cache = self._fork_optimization_cache()
+                self.extend_optimization_patterns()
+            self.advance_streak_tracker()
+        
+        print(f"✓ Data berhasil dimuat: {len(self.data)} records dari {data[0]['date'].year}-{data[-1]['date'].year}")
+        return len(self.data) >= self.min_records
+    
+    def serve_stale(self):
+        """Sumber tidak tersedia: pakai data di memori, atau snapshot last good di disk"""
+        print(f"Sumber tidak tersedia (circuit {self.breaker.state}), memakai data terakhir")
+        if not self.data and not self.load_snapshot(self.snapshot_path):
+            return False
+        self.is_stale = True
+        return len(self.data) >= 2
+    
+    def mark_source_fresh(self):
+        """Data sekarang terkonfirmasi sama dengan sumber"""
+        self.is_stale = False
+        self.source_updated_at = datetime.now()
+    
+    def persist_snapshot(self):
+        """Listener publish store: tulis snapshot last good jika data ini belum di disk.
+        
+        Draft yang tidak dipublish (ingest gagal / data kurang) tidak pernah
+        menimpa snapshot; flag tidak direset di sini karena snapshot yang
+        dipublish tidak dimutasi - clone() yang memulai dengan False.
+        """
+        if not self.snapshot_pending:
+            return
+        try:
+            self.save_snapshot(self.snapshot_path)
+        except OSError as e:
+            print(f"Snapshot tidak tersimpan: {e}")
+    
+    def get_data_freshness(self):
+        """Status kesegaran data untuk indikator staleness di UI"""
+        age_minutes = None
+        if self.source_updated_at:
+            age_minutes = int((datetime.now() - self.source_updated_at).total_seconds() // 60)
+        return {
+            'stale': self.is_stale,
+            'source_updated_at': self.source_updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.source_updated_at else None,
+            'age_minutes': age_minutes,
+            'breaker': self.breaker.status()
+        }
+    
+    def in_year_range(self, date_obj):
+        """Cek apakah tanggal masuk range tahun yang dikonfigurasi"""
+        return self.min_year <= date_obj.year and (self.max_year is None or date_obj.year <= self.max_year)
+    
+    def _index_data(self):
+        """Build index vektor (fitur 4D, tanggal) setelah self.data diganti"""
+        self.features = DigitFeatureIndex.from_records(self.data, DAY_INDEX)
+        self.date_index = DateIndex(self.data, DAY_INDEX)
+    
+    def data_bounds(self, start=None, end=None):
+        """Posisi (lo, hi) data dengan start <= tanggal <= end, tanpa menyalin data"""
+        if self.date_index is None or len(self.date_index) != len(self.data):
+            self._index_data()
+        return self.date_index.bounds(start, end)
+    
+    def _extends_current_data(self, new_data):
+        """True jika new_data = data sekarang (seluruh prefix sama) + draw baru di belakang"""
+        if not self.data or len(new_data) < len(self.data):
+            return False
+        # Seluruh prefix dibandingkan: koreksi draw lama di tengah history = rewrite
+        return all(
+            old['date'] == new['date'] and old['result'] == new['result']
+            for old, new in zip(self.data, new_data)
+        )
+    
+    def _fork_optimization_cache(self):
+        """Copy-on-write pola sebelum extend: hanya entry yang disentuh suffix baru yang disalin.
+        
+        Pola snapshot yang dipublish dibagi dengan reader, jadi list per
+        (hari, input) / input yang akan di-append disalin; sisanya tetap dibagi.
+        Dict index (maks 7 x 100 key), Counter global dan DecayedFrequencyBank
+        berukuran tetap, tidak tumbuh dengan history.
+        """
+        cache = dict(self.optimization_cache)
+        day_patterns = {day: dict(inputs) for day, inputs in cache['day_patterns'].items()}
+        input_patterns = dict(cache['input_patterns'])
+        copied = set()
+        for i in range(max(cache['built_until'] - 1, 0), len(self.data) - 1):
+            day, input_2d = self.data[i]['day'], self.data[i]['last_2d']
+            if (day, input_2d) not in copied:
+                copied.add((day, input_2d))
+                inputs = day_patterns.setdefault(day, {})
+                if input_2d in inputs:
+                    inputs[input_2d] = list(inputs[input_2d])
+            if input_2d not in copied:
+                copied.add(input_2d)
+                if input_2d in input_patterns:
+                    input_patterns[input_2d] = list(input_patterns[input_2d])
+        cache['day_patterns'] = day_patterns
+        cache['input_patterns'] = input_patterns
+        cache['global_freq'] = Counter(cache['global_freq'])
+        cache['decayed'] = copy.deepcopy(cache['decayed'])
+        return cache
+    
+    def _make_record(self, date_obj, day_name, result):
+        """Build satu record data dari hasil parsing"""
+        return {
+            'date': date_obj,
+            'day': self.standardize_day(day_name),
+            'result': result,
+            'last_2d': result[-2:]
+        }
+    
+    def save_snapshot(self, path=SNAPSHOT_PATH):
+        """Simpan data ke snapshot lokal (JSON) untuk start cepat tanpa network"""
+        payload = {
+            'source': self.url,
+            'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'records': [
+                {'date': item['date'].strftime('%Y-%m-%d'), 'day': item['day'], 'result': item['result']}
+                for item in self.data
+            ]
+        }
+        # Tulis ke file sementara lalu rename: pembaca tidak pernah melihat file setengah jadi
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return path
+    
+    def load_snapshot(self, path=SNAPSHOT_PATH):
+        """Load data dari snapshot lokal, return True jika berhasil"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading snapshot: {e}")
+            return False
+        
+        data = []
+        for row in payload.get('records', []):
+            try:
+                date_obj = datetime.strptime(row['date'], '%Y-%m-%d')
+            except (KeyError, TypeError, ValueError):
+                continue
+            # Baris rusak (result hilang / bukan 4 digit ASCII) dilewati
+            if not isinstance(row.get('result'), str) or not RESULT_PATTERN.fullmatch(row['result']):
+                continue
+            if self.in_year_range(date_obj):
+                data.append(self._make_record(date_obj, row.get('day', ''), row['result']))
+        
+        data.sort(key=lambda x: x['date'])
+        self.data = data
+        self._index_data()
+        self.optimization_cache = {}
+        self.streak_tracker.reset()
+        self.performance_data = None
+        self.last_updated = datetime.now()
+        try:
+            self.source_updated_at = datetime.strptime(payload.get('saved_at', ''), '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            self.source_updated_at = None
+        return len(self.data) >= 2
+    
+    def save_bundle(self, path=BUNDLE_PATH):
+        """Simpan warm-start bundle: data, pola, checkpoint backtest dan performance_data"""
+        if not self.optimization_cache:
+            self.build_optimization_patterns()
+        self.run_performance_test()
+        payload = {
+            'format': BUNDLE_FORMAT,
+            'source': self.url,
+            'saved_at': datetime.now(),
+            'min_year': self.min_year,
+            'max_year': self.max_year,
+            'decay_half_lives': self.decay_half_lives,
+            'source_digest': self.source_digest,
+            'data': self.data,
+            'optimization_cache': self.optimization_cache,
+            'streak_tracker': self.streak_tracker,
+            'performance_data': self.performance_data
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+    
+    def load_bundle(self, path=BUNDLE_PATH):
+        """Load warm-start bundle hasil setup_deployment.py (file lokal terpercaya).
+        
+        Return True jika bundle cocok dengan konfigurasi system ini; data
+        tetap perlu di-refresh dari sumber (watcher / fetch) setelahnya.
+        """
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            print(f"Bundle tidak bisa dimuat: {e}")
+            return False
+        
+        config = (self.min_year, self.max_year, tuple(self.decay_half_lives))
+        bundle_config = (payload.get('min_year'), payload.get('max_year'), tuple(payload.get('decay_half_lives', ())))
+        if payload.get('format') != BUNDLE_FORMAT or config != bundle_config:
+            print("Bundle tidak cocok dengan konfigurasi, diabaikan")
+            return False
+        
+        self.data = payload['data']
+        self._index_data()
+        self.optimization_cache = payload['optimization_cache']
+        self.pattern_version = self.optimization_cache['version']
+        self.streak_tracker = payload['streak_tracker']
+        self.performance_data = payload['performance_data']
+        self.source_digest = payload['source_digest']
+        self.source_updated_at = payload['saved_at']
+        self.last_updated = datetime.now()
+        print(f"✓ Bundle dimuat: {len(self.data)} records, data per {payload['saved_at']:%Y-%m-%d %H:%M}")
+        return len(self.data) >= 2
+    
+    def build_prediction_table(self, loss_context=0):
+        """Precompile BBFS untuk semua kombinasi (day, input_2d) -> list digit"""
+        if not self.optimization_cache:
+            self.build_optimization_patterns()
+        
+        table = {}
+        for day in DAYS:
+            for n in range(100):
+                input_2d = f"{n:02d}"
+                table[(day, input_2d)] = self.generate_optimized_bbfs(input_2d, day, loss_context)
+        return table
+    
     def standardize_day(self, day_name):
         """Standardize day names"""
         day_mapping = {
@@ -85,16 +381,35 @@ class OptimizedBBFSSystem:
         }
         return day_mapping.get(day_name.lower(), 'senin')
     
-    def build_optimization_patterns(self):
-        """Build patterns untuk optimasi BBFS"""
+    def build_optimization_patterns(self, end=None):
+        """Build patterns untuk optimasi BBFS (dari data[:end], default semua data)"""
         print("Membangun pola optimasi BBFS...")
         
-        # Analisis pattern berdasarkan day dan input
-        day_patterns = defaultdict(lambda: defaultdict(list))
-        input_patterns = defaultdict(list)
-        global_freq = Counter()
+        # Pola berubah -> ledger streak harus dihitung ulang dengan pola baru
+        self.streak_tracker.reset()
+        self.pattern_version += 1
+        self.optimization_cache = {
+            'version': self.pattern_version,
+            'day_patterns': {},
+            'input_patterns': {},
+            'global_freq': Counter(),
+            'decayed': DecayedFrequencyBank(self.decay_half_lives),
+            'built_until': 0
+        }
+        self.extend_optimization_patterns(end)
+        
+        print(f"✓ Pola optimasi berhasil dibangun")
+    
+    def extend_optimization_patterns(self, end=None):
+        """Tambah transisi data[built_until-1 .. end-1] ke pola yang sudah ada (tanpa rebuild)"""
+        cache = self.optimization_cache
+        day_patterns = cache['day_patterns']
+        input_patterns = cache['input_patterns']
+        global_freq = cache['global_freq']
+        decayed = cache['decayed']
         
-        for i in range(len(self.data) - 1):
+        end = len(self.data) if end is None else min(end, len(self.data))
+        for i in range(max(cache['built_until'] - 1, 0), end - 1):
             current = self.data[i]
             next_item = self.data[i + 1]
             
@@ -103,26 +418,36 @@ class OptimizedBBFSSystem:
             next_2d = next_item['last_2d']
             
             # Day-input patterns
-            day_patterns[day][input_2d].append(next_2d)
+            day_patterns.setdefault(day, {}).setdefault(input_2d, []).append(next_2d)
             
             # Input patterns
-            input_patterns[input_2d].append(next_2d)
+            input_patterns.setdefault(input_2d, []).append(next_2d)
             
             # Global frequency
             for digit in next_2d:
                 global_freq[digit] += 1
+            
+            # Recency-weighted counts (O(1) per draw untuk semua half-life)
+            decayed.update(input_2d, next_2d)
         
-        self.optimization_cache = {
-            'day_patterns': dict(day_patterns),
-            'input_patterns': dict(input_patterns),
-            'global_freq': global_freq
-        }
-        
-        print(f"✓ Pola optimasi berhasil dibangun")
+        cache['built_until'] = max(cache['built_until'], end)
     
-    def generate_optimized_bbfs(self, input_2d, day, loss_context=0):
-        """Generate BBFS yang dioptimalkan untuk target maksimal 8 loss beruntun"""
+    def build_sparse_context(self, max_order=3, use_weekday=False):
+        """Build index konteks orde tinggi (last k draw) untuk eksperimen"""
+        self.sparse_context = SparseContextIndex(max_order, use_weekday).extend(
+            [item['last_2d'] for item in self.data],
+            [DAY_INDEX.get(item['day'], 0) for item in self.data]
+        )
+        return self.sparse_context
+    
+    def generate_optimized_bbfs(self, input_2d, day, loss_context=0, decay_half_life=None):
+        """Generate BBFS yang dioptimalkan untuk target maksimal 8 loss beruntun.
+        
+        decay_half_life (salah satu dari decay_half_lives) mengganti frekuensi
+        input/global dengan versi recency-weighted; None = count biasa.
+        """
         candidates = set()
+        decayed = self.optimization_cache.get('decayed') if decay_half_life else None
         
         # Strategy 1: Always include input digits (highest priority)
         candidates.update(list(input_2d))
@@ -144,7 +469,10 @@ class OptimizedBBFSSystem:
                     candidates.update(top_digits)
         
         # Strategy 3: Input-specific patterns (regardless of day)
-        if input_2d in self.optimization_cache.get('input_patterns', {}):
+        if decayed is not None:
+            weights = decayed.transitions(decay_half_life, input_2d)
+            candidates.update(str(d) for d in np.argsort(-weights, kind='stable')[:4] if weights[d] > 0)
+        elif input_2d in self.optimization_cache.get('input_patterns', {}):
             next_possibilities = self.optimization_cache['input_patterns'][input_2d]
             next_digits = []
             for next_2d in next_possibilities:
@@ -157,6 +485,11 @@ class OptimizedBBFSSystem:
         
         # Strategy 4: Global high frequency digits
         global_freq = self.optimization_cache.get('global_freq', Counter())
+        if decayed is not None:
+            # Skala ulang ke total massa count biasa agar bobot skor sebanding
+            weights = decayed.digits(decay_half_life)
+            mass = sum(global_freq.values()) / max(weights.sum(), 1e-12)
+            global_freq = Counter({str(d): weights[d] * mass for d in range(10) if weights[d] > 0})
         top_global = [d for d, _ in global_freq.most_common(8)]
         candidates.update(top_global[:5])
         
@@ -223,15 +556,22 @@ class OptimizedBBFSSystem:
         
         return bbfs[:5]
     
-    def test_comprehensive_performance(self):
-        """Test performance dengan akurasi data yang ketat"""
+    def test_comprehensive_performance(self, start=None, end=None):
+        """Test performance dengan akurasi data yang ketat.
+        
+        start/end (tanggal, inklusif) membatasi range backtest; hasil dengan
+        range tidak menggantikan self.performance_data.
+        """
         print("Testing comprehensive performance...")
         
         if not self.optimization_cache:
             self.build_optimization_patterns()
         
+        lo, hi = self.data_bounds(start, end)
+        full_run = start is None and end is None
+        
         # Validasi data input terlebih dahulu
-        if len(self.data) < 2:
+        if hi - lo < 2:
             print("Error: Data tidak cukup untuk analisis")
             return None
         
@@ -244,8 +584,13 @@ class OptimizedBBFSSystem:
         win_details = []
         loss_details = []
         
+        # Backtest penuh sekaligus menjadi ledger untuk live streak tracker
+        tracker = self.streak_tracker if full_run else LossStreakTracker()
+        tracker.reset()
+        tracker.pattern_version = self.optimization_cache.get('version')
+        
         # Hitung dengan algoritma yang konsisten dan akurat
-        for i in range(len(self.data) - 1):
+        for i in range(lo, hi - 1):
             current = self.data[i]
             next_item = self.data[i + 1]
             
@@ -273,6 +618,7 @@ class OptimizedBBFSSystem:
             
             # Pastikan validasi benar: semua digit 2D harus ada di BBFS
             is_win = next_2d_digits.issubset(bbfs_digits)
+            tracker.record(i, current, next_item, bbfs, is_win)
             
             total_tests += 1
             
@@ -281,39 +627,13 @@ class OptimizedBBFSSystem:
                 if consecutive_losses > 0:
                     loss_streaks.append(consecutive_losses)
                 consecutive_losses = 0
-                
-                win_details.append({
-                    'date': current['date'],
-                    'result': current['result'],
-                    'next': next_item['result'],
-                    'bbfs': ''.join(sorted(bbfs)),  # Sort untuk konsistensi
-                    'day': current['day'],
-                    'input_2d': current['last_2d'],
-                    'actual_2d': next_item['last_2d']
-                })
             else:
                 consecutive_losses += 1
                 max_consecutive = max(max_consecutive, consecutive_losses)
-                
-                loss_details.append({
-                    'date': current['date'],
-                    'result': current['result'],
-                    'next': next_item['result'],
-                    'bbfs': ''.join(sorted(bbfs)),
-                    'day': current['day'],
-                    'loss_number': consecutive_losses,
-                    'input_2d': current['last_2d'],
-                    'actual_2d': next_item['last_2d']
-                })
             
-            results.append({
-                'date': current['date'],
-                'input_2d': current['last_2d'],
-                'next_2d': next_item['last_2d'],
-                'bbfs': bbfs,
-                'is_win': is_win,
-                'consecutive_losses': consecutive_losses
-            })
+            detail, result_row = self._ledger_rows(current, next_item, bbfs, is_win, consecutive_losses)
+            (win_details if is_win else loss_details).append(detail)
+            results.append(result_row)
         
         # Final streak calculation
         if consecutive_losses > 0:
@@ -331,7 +651,7 @@ class OptimizedBBFSSystem:
         print(f"VALIDASI: Max Loss={max_consecutive}, Loss Streaks Count={len(loss_streaks)}")
         
         # Simpan hasil dengan validasi ketat
-        self.performance_data = {
+        performance_data = {
             'total_tests': total_tests,
             'total_wins': total_wins,
             'total_losses': total_tests - total_wins,
@@ -344,12 +664,14 @@ class OptimizedBBFSSystem:
             'loss_details': loss_details[-100:],
             'results': results[-100:],
             'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'data_range': f"{self.data[0]['date'].strftime('%Y-%m-%d')} - {self.data[-1]['date'].strftime('%Y-%m-%d')}",
-            'total_data_records': len(self.data)
+            'data_range': f"{self.data[lo]['date'].strftime('%Y-%m-%d')} - {self.data[hi - 1]['date'].strftime('%Y-%m-%d')}",
+            'total_data_records': hi - lo
         }
+        if full_run:
+            self.performance_data = performance_data
         
         print(f"Performance: Win Rate {win_rate:.1f}%, Max Loss {max_consecutive}")
-        return self.performance_data
+        return performance_data
         
         self.performance_data = {
             'total_tests': total_tests,
@@ -366,61 +688,183 @@ class OptimizedBBFSSystem:
         print(f"Performance: Win Rate {win_rate:.1f}%, Max Loss {max_consecutive}")
         return self.performance_data
     
-    def run_performance_test(self):
+    def _ledger_rows(self, current, next_item, bbfs, is_win, consecutive_losses):
+        """Detail win/loss dan baris results untuk satu transisi backtest"""
+        detail = {
+            'date': current['date'],
+            'result': current['result'],
+            'next': next_item['result'],
+            'bbfs': ''.join(sorted(bbfs)),  # Sort untuk konsistensi
+            'day': current['day'],
+            'input_2d': current['last_2d'],
+            'actual_2d': next_item['last_2d']
+        }
+        if not is_win:
+            detail['loss_number'] = consecutive_losses
+        
+        result_row = {
+            'date': current['date'],
+            'input_2d': current['last_2d'],
+            'next_2d': next_item['last_2d'],
+            'bbfs': bbfs,
+            'is_win': is_win,
+            'consecutive_losses': consecutive_losses
+        }
+        return detail, result_row
+    
+    def backtest_range(self, start, end, consecutive_losses=0):
+        """Backtest ringkas transisi data[i] -> data[i+1] untuk i di [start, end)
+        
+        Memakai loss context yang sama dengan test_comprehensive_performance;
+        streak yang masih terbuka di akhir dikembalikan di 'consecutive_losses'.
+        """
+        total_tests = 0
+        total_wins = 0
+        max_consecutive = 0
+        loss_streaks = []
+        
+        for i in range(start, min(end, len(self.data) - 1)):
+            current = self.data[i]
+            bbfs = self.generate_optimized_bbfs(current['last_2d'], current['day'], consecutive_losses)
+            
+            total_tests += 1
+            if set(self.data[i + 1]['last_2d']).issubset(bbfs):
+                total_wins += 1
+                if consecutive_losses > 0:
+                    loss_streaks.append(consecutive_losses)
+                consecutive_losses = 0
+            else:
+                consecutive_losses += 1
+                max_consecutive = max(max_consecutive, consecutive_losses)
+        
+        return {
+            'total_tests': total_tests,
+            'total_wins': total_wins,
+            'max_consecutive_loss': max_consecutive,
+            'loss_streaks': loss_streaks,
+            'consecutive_losses': consecutive_losses
+        }
+    
+    def backtest_variants(self, variants, start=None, end=None):
+        """Backtest beberapa varian generate_optimized_bbfs dalam satu pass data.
+        
+        variants: dict nama -> kwargs tambahan (mis. {'decay_half_life': 90});
+        setiap varian membawa loss context-nya sendiri seperti backtest_range.
+        """
+        if not self.optimization_cache:
+            self.build_optimization_patterns()
+        
+        lo, hi = self.data_bounds(start, end)
+        positions = range(lo, max(hi - 1, lo))
+        contexts = [(self.data[i]['last_2d'], self.data[i]['day']) for i in positions]
+        targets = [MASK_2D[self.data[i + 1]['last_2d']] for i in positions]
+        strategies = [
+            lambda context, loss_context, kwargs=kwargs: self.generate_optimized_bbfs(
+                context[0], context[1], loss_context, **kwargs
+            )
+            for kwargs in variants.values()
+        ]
+        batch = multi_strategy_backtest(contexts, targets, strategies)
+        
+        results = {}
+        for s, name in enumerate(variants):
+            total_tests = int(batch['size'][s])
+            total_wins = int(batch['wins'][s])
+            results[name] = {
+                'total_tests': total_tests,
+                'total_wins': total_wins,
+                'win_rate': round(total_wins / total_tests * 100, 1) if total_tests else 0,
+                'max_consecutive_loss': int(batch['max_streak'][s]),
+                'loss_streaks': loss_streaks(batch['streak'][:total_tests, s])
+            }
+        return results
+    
+    def run_performance_test(self, start=None, end=None):
         """Run performance test dan simpan hasil dengan caching konsisten"""
-        # Jika sudah ada hasil yang di-cache, gunakan itu untuk konsistensi
-        if hasattr(self, 'performance_data') and self.performance_data:
-            return self.performance_data
+        # Range tanggal tertentu selalu dihitung langsung (tidak di-cache)
+        if start is not None or end is not None:
+            return self.test_comprehensive_performance(start, end)
+        
+        # Hasil cache + checkpoint di akhir history: cukup evaluasi draw baru.
+        # Jika pola sudah di-rebuild (versi berubah), advance_streak_tracker
+        # membuang performance_data sehingga backtest penuh dijalankan ulang.
+        if self.performance_data:
+            self.advance_streak_tracker()
+            if self.performance_data:
+                return self.performance_data
         
         # Hanya run test jika belum ada hasil
         return self.test_comprehensive_performance()
     
-    def get_current_loss_streak_analysis(self, limit=10):
-        """Analisis current loss streak REAL-TIME yang akurat"""
-        if not self.data or len(self.data) < 2:
-            return 0, []
-        
-        # Pastikan menggunakan optimization cache yang sudah dibangun
+    def advance_streak_tracker(self):
+        """Proses draw yang belum masuk tracker (O(1) per draw baru) dengan live loss context"""
         if not self.optimization_cache:
             self.build_optimization_patterns()
         
-        current_streak = 0
-        streak_details = []
+        tracker = self.streak_tracker
+        version = self.optimization_cache.get('version')
+        if tracker.pattern_version != version:
+            # Checkpoint dibuat dengan pola lama -> ledger dihitung ulang dari awal
+            tracker.reset()
+            tracker.pattern_version = version
+            self.performance_data = None
         
-        # Analisis dari data terbaru mundur dengan chronological order yang benar
-        # Data sudah di-sort ascending, jadi ambil yang terakhir
-        recent_data = self.data[-limit:] if len(self.data) >= limit else self.data
+        start = tracker.position
+        rows = []
+        for i in range(start, len(self.data) - 1):
+            current = self.data[i]
+            next_item = self.data[i + 1]
+            bbfs = self.generate_optimized_bbfs(current['last_2d'], current['day'], tracker.consecutive_losses)
+            is_win = set(next_item['last_2d']).issubset(bbfs)
+            tracker.record(i, current, next_item, bbfs, is_win)
+            if self.performance_data:
+                rows.append(self._ledger_rows(current, next_item, bbfs, is_win, tracker.consecutive_losses))
         
-        # Test dari data terbaru ke belakang untuk mencari current active streak
-        for i in range(len(recent_data) - 1, 0, -1):  # Mundur dari yang terbaru
-            prev_item = recent_data[i - 1]  # Data sebelumnya (input untuk prediksi)
-            current = recent_data[i]        # Data hasil (untuk validasi)
-            
-            # Generate BBFS berdasarkan data sebelumnya
-            bbfs = self.generate_optimized_bbfs(prev_item['last_2d'], prev_item['day'], 0)
-            current_2d_digits = set(current['last_2d'])
-            bbfs_digits = set(bbfs)
-            
-            # Check apakah BBFS berhasil cover result
-            is_win = current_2d_digits.issubset(bbfs_digits)
-            
-            if not is_win:
-                current_streak += 1
-                streak_details.insert(0, {  # Insert di awal untuk urutan chronological
-                    'date': prev_item['date'],
-                    'input_result': prev_item['result'],
-                    'actual_result': current['result'],
-                    'input_2d': prev_item['last_2d'],
-                    'actual_2d': current['last_2d'],
-                    'bbfs_used': ''.join(bbfs),
-                    'day': prev_item['day'],
-                    'loss_number': current_streak
-                })
-            else:
-                # Ketemu win, stop counting
-                break
+        if rows:
+            self._apply_backtest_suffix(rows)
+        return tracker
+    
+    def _apply_backtest_suffix(self, rows):
+        """Update performance_data dari checkpoint tracker + baris draw baru (O(draw baru))"""
+        tracker = self.streak_tracker
+        perf = self.performance_data
+        for detail, result_row in rows:
+            perf['win_details' if result_row['is_win'] else 'loss_details'].append(detail)
+            perf['results'].append(result_row)
+        for key in ('win_details', 'loss_details', 'results'):
+            perf[key] = perf[key][-100:]
+        
+        win_rate = tracker.total_wins / tracker.total_tests * 100
+        perf.update({
+            'total_tests': tracker.total_tests,
+            'total_wins': tracker.total_wins,
+            'total_losses': tracker.total_tests - tracker.total_wins,
+            'win_rate': round(win_rate, 1),
+            'loss_rate': round(100 - win_rate, 1),
+            'max_consecutive_loss': tracker.max_consecutive,
+            'loss_streaks': tracker.all_loss_streaks(),
+            'meets_target': tracker.max_consecutive <= 10,
+            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'data_range': f"{self.data[0]['date'].strftime('%Y-%m-%d')} - {self.data[-1]['date'].strftime('%Y-%m-%d')}",
+            'total_data_records': len(self.data)
+        })
+        print(f"Backtest suffix: {len(rows)} draw baru, Win Rate {win_rate:.1f}%, Max Loss {tracker.max_consecutive}")
+    
+    def get_live_loss_context(self):
+        """Loss context untuk prediksi draw berikutnya (sama dengan backtest ledger)"""
+        if not self.data or len(self.data) < 2:
+            return 0
+        return self.advance_streak_tracker().consecutive_losses
+    
+    def get_current_loss_streak_analysis(self, limit=None):
+        """Current loss streak REAL-TIME dari tracker: (streak, detail kronologis).
         
-        return current_streak, streak_details
+        Tanpa batas panjang streak; limit hanya membatasi jumlah detail terbaru.
+        """
+        if not self.data or len(self.data) < 2:
+            return 0, []
+        
+        return self.advance_streak_tracker().snapshot(limit)
     
     def get_performance_summary(self):
         """Get performance summary"""
@@ -435,6 +879,41 @@ class OptimizedBBFSSystem:
             'meets_target': self.performance_data['meets_target']
         }
     
+    def get_bootstrap_intervals(self, n_resamples=2000, block_length=None, confidence=0.95, seed=0):
+        """Confidence interval (block bootstrap) win rate, max loss dan histogram streak backtest.
+        
+        Parameter default sudah dihitung freeze() di draft; snapshot yang
+        dipublish hanya dibaca (parameter lain dihitung tanpa disimpan).
+        """
+        tracker = self.streak_tracker
+        if not self.performance_data or not tracker.total_tests:
+            return None
+        
+        cached = self.performance_cache.get(self._statistic_key('bootstrap', n_resamples, block_length, confidence, seed))
+        if cached is not None:
+            return cached
+        return block_bootstrap(
+            np.frombuffer(bytes(tracker.outcomes), dtype=np.uint8), n_resamples, block_length, confidence, seed
+        )
+    
+    def get_streak_baseline(self, win_probability=None):
+        """Baseline exact (DP) max loss + histogram streak untuk BBFS acak 5 digit.
+        
+        win_probability None = peluang BBFS acak atas 2D target history ini;
+        isi win rate sendiri untuk menguji streak terhadap win rate system.
+        """
+        if not self.performance_data:
+            return None
+        
+        cached = self.performance_cache.get(self._statistic_key('baseline', win_probability))
+        if cached is not None:
+            return cached
+        if win_probability is None:
+            win_probability = random_bbfs_win_probability([item['last_2d'] for item in self.data[1:]])
+        return streak_baseline(
+            self.performance_data['total_tests'], win_probability, self.performance_data['max_consecutive_loss']
+        )
+    
     def get_consecutive_loss_breakdown(self):
         """Get breakdown of consecutive losses"""
         if not hasattr(self, 'performance_data') or not self.performance_data or not self.performance_data.get('loss_streaks'):
@@ -455,38 +934,47 @@ class OptimizedBBFSSystem:
         
         return breakdown
     
-    def get_latest_results(self, limit=10):
-        """Get latest results in chronological order (newest first)"""
+    def get_latest_results(self, limit=10, start=None, end=None):
+        """Get latest results in chronological order (newest first), opsional dalam range tanggal"""
         if not self.data:
             return []
         
         # Return data terbaru dalam urutan terbaru ke lama
-        return list(reversed(self.data[-limit:]))
+        lo, hi = self.data_bounds(start, end)
+        return [self.data[i] for i in range(hi - 1, max(lo, hi - limit) - 1, -1)]
     
     def get_real_time_analysis(self, limit=8):
-        """Analisis real-time untuk menampilkan win/loss yang akurat"""
+        """Analisis real-time win/loss: transisi terakhir dari ledger tracker.
+        
+        BBFS dibangun ulang dengan loss context yang dipakai ledger saat itu
+        (jumlah loss beruntun sebelum transisi), sehingga win/loss sama
+        dengan backtest dan current streak.
+        """
         if not self.data or len(self.data) < 2:
             return []
         
-        # Pastikan optimization cache tersedia
-        if not self.optimization_cache:
-            self.build_optimization_patterns()
+        tracker = self.advance_streak_tracker()
+        outcomes = tracker.outcomes
+        first = max(len(outcomes) - limit, 0)
         
-        analysis_results = []
-        recent_data = self.data[-limit-1:] if len(self.data) > limit else self.data
+        # Loss context sebelum transisi pertama = loss beruntun tepat sebelumnya
+        loss_context = 0
+        for k in range(first - 1, -1, -1):
+            if outcomes[k]:
+                break
+            loss_context += 1
         
-        # Analisis dari data kedua terakhir sampai yang terbaru
-        for i in range(len(recent_data) - 1):
-            current = recent_data[i]      # Input untuk prediksi
-            next_item = recent_data[i + 1] # Hasil aktual
+        analysis_results = []
+        for k in range(first, len(outcomes)):
+            i = tracker.positions[k]
+            current = self.data[i]            # Input untuk prediksi
+            next_item = self.data[i + 1]      # Hasil aktual
             
-            # Generate BBFS berdasarkan current data
-            bbfs = self.generate_optimized_bbfs(current['last_2d'], current['day'], 0)
+            bbfs = self.generate_optimized_bbfs(current['last_2d'], current['day'], loss_context)
             next_2d_digits = set(next_item['last_2d'])
             bbfs_digits = set(bbfs)
-            
-            # Validasi win/loss
-            is_win = next_2d_digits.issubset(bbfs_digits)
+            is_win = bool(outcomes[k])
+            loss_context = 0 if is_win else loss_context + 1
             
             analysis_results.append({
                 'date': current['date'],
@@ -505,6 +993,60 @@ class OptimizedBBFSSystem:
         # Return dalam urutan terbaru ke lama
         return list(reversed(analysis_results))
     
+    def clone(self):
+        """Copy-on-write clone untuk refresh di luar snapshot yang sedang dibaca.
+        
+        Record data, index dan pola dibagi (refresh selalu mengganti, bukan
+        memutasi); tracker dan performance_data yang di-update in-place disalin.
+        Circuit breaker sengaja dibagi: state sumber berlaku per proses.
+        """
+        other = copy.copy(self)
+        other.streak_tracker = copy.deepcopy(self.streak_tracker)
+        if self.performance_data:
+            other.performance_data = {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in self.performance_data.items()
+            }
+        other.performance_cache = dict(self.performance_cache)
+        other.loss_analysis = dict(self.loss_analysis)
+        other.snapshot_pending = False  # sudah ditulis listener saat self dipublish
+        return other
+    
+    def freeze(self):
+        """Selesaikan state lazy (pola, backtest, tracker, statistik) sebelum dipublish ke reader"""
+        if len(self.data) >= 2:
+            self.run_performance_test()
+            self._precompute_statistics()
+        return self
+    
+    def _precompute_statistics(self):
+        """Isi performance_cache untuk ledger sekarang (hanya di draft, sebelum publish).
+        
+        Cache diganti dict baru: entry ledger lama otomatis hilang, dan dict
+        milik snapshot yang sedang dibaca tidak pernah dimutasi.
+        """
+        previous = self.performance_cache
+        self.performance_cache = {}
+        if not self.performance_data or not self.streak_tracker.total_tests:
+            return
+        # (key, fungsi) untuk parameter default yang dibaca UI
+        statistics = [
+            (self._statistic_key('bootstrap', 2000, None, 0.95, 0), self.get_bootstrap_intervals),
+            (self._statistic_key('baseline', None), self.get_streak_baseline),
+        ]
+        own_win_probability = self.performance_data['win_rate'] / 100  # baseline "win rate sama" di UI
+        statistics.append((
+            self._statistic_key('baseline', own_win_probability),
+            lambda: self.get_streak_baseline(own_win_probability)
+        ))
+        for key, compute in statistics:
+            self.performance_cache[key] = previous.get(key) or compute()
+    
+    def _statistic_key(self, name, *params):
+        """Key performance_cache: statistik + parameter untuk ledger tracker sekarang"""
+        tracker = self.streak_tracker
+        return (name, tracker.pattern_version, tracker.total_tests, *params)
+    
     def get_data_info(self):
         """Get data information"""
         if not self.data:
@@ -519,12 +1061,17 @@ class OptimizedBBFSSystem:
             'last_updated': self.last_updated.strftime('%Y-%m-%d %H:%M:%S') if self.last_updated else None
         }
 
-# Singleton instance
-_optimized_system = None
+# Singleton store; snapshot yang dipublish tidak dimutasi lagi
+_system_store = None
+
+def get_system_store():
+    """Get singleton SnapshotStore berisi OptimizedBBFSSystem terbaru"""
+    global _system_store
+    if _system_store is None:
+        _system_store = SnapshotStore(OptimizedBBFSSystem(), prepare=OptimizedBBFSSystem.freeze)
+        _system_store.listeners.append(OptimizedBBFSSystem.persist_snapshot)
+    return _system_store
 
 def get_optimized_system():
-    """Get singleton system instance"""
-    global _optimized_system
-    if _optimized_system is None:
-        _optimized_system = OptimizedBBFSSystem()
-    return _optimized_system
\ No newline at end of file
+    """Get snapshot system terbaru (ambil sekali per render / request)"""
+    return get_system_store().current
\ No newline at end of file
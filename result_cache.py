@@ -0,0 +1,163 @@
+"""
+Cache hasil evaluasi strategi (memory + disk) dengan key fingerprint.
+
+Key = sha1 dari JSON kanonik bagian-bagian key, mis. (kode strategi, versi
+data, range test, seed). Entry disimpan di dict in-memory dan di-append ke
+satu file log pickle, sehingga run ulang dan search yang direstart memakai
+evaluasi sebelumnya tanpa menghitung ulang. Record terakhir yang terpotong
+(proses mati saat menulis) diabaikan saat load.
+
+Setiap record diberi versi data; compact(data_version) membuang entry versi
+lain (tidak akan pernah cocok lagi) dan menulis ulang log, sehingga file
+tidak tumbuh terus setiap kali data berubah.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+
+CACHE_PATH = os.environ.get("BBFS_RESULT_CACHE_PATH", "bbfs_result_cache.pkl")  # artefak runtime
+CACHE_FORMAT = 2
+
+
+def fingerprint(*parts):
+    """Fingerprint stabil untuk tuple bagian key (harus bisa di-JSON-kan)"""
+    canonical = json.dumps([CACHE_FORMAT, *parts], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _code_digest(code):
+    try:
+        source = inspect.getsource(code)
+    except (OSError, TypeError):
+        source = code.co_code.hex()
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+
+def code_fingerprint(*funcs):
+    """Fingerprint source fungsi/method: berubah jika kode strategi berubah"""
+    return [_code_digest(getattr(func, '__func__', func).__code__) for func in funcs]
+
+
+class ResultCache:
+    """Dict in-memory di depan file log append-only (path None = memory saja)"""
+
+    def __init__(self, path=CACHE_PATH, data_version=None):
+        self.path = path
+        self.data_version = data_version  # None = entry semua versi dipertahankan
+        self.entries = {}
+        self.versions = {}                # key -> versi data saat entry disimpan
+        self.lock = threading.Lock()
+        self.loaded = not path
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'loaded': 0, 'compacted': 0}
+
+    def _load(self):
+        """Baca semua record log ke memory (sekali, saat get/put pertama)"""
+        self.loaded = True
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            good = 0
+            while good < size:
+                try:
+                    record = pickle.load(f)
+                    key, value, version = record if len(record) == 3 else (*record, None)
+                except (EOFError, pickle.UnpicklingError, ValueError, TypeError) as e:
+                    print(f"Record result cache rusak di akhir {self.path}, dipotong: {e}")
+                    break
+                self.entries[key] = value
+                self.versions[key] = version
+                self.stats['loaded'] += 1
+                good = f.tell()
+        if good < size:
+            # Buang record terpotong agar append berikutnya tetap terbaca
+            os.truncate(self.path, good)
+        self._compact()
+
+    def _compact(self):
+        """Buang entry versi data lain, lalu tulis ulang log jika ada yang dibuang"""
+        if self.data_version is None:
+            return
+        stale = [key for key, version in self.versions.items() if version != self.data_version]
+        for key in stale:
+            del self.entries[key]
+            del self.versions[key]
+        self.stats['compacted'] += len(stale)
+        if not stale or not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for key, value in self.entries.items():
+                    pickle.dump((key, value, self.versions[key]), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Gagal compact result cache: {e}")
+
+    def compact(self, data_version):
+        """Pakai versi data data_version: entry versi lain dibuang (memory dan disk)"""
+        with self.lock:
+            if data_version == self.data_version and self.loaded:
+                return
+            self.data_version = data_version
+            if not self.loaded:
+                self._load()
+            else:
+                self._compact()
+
+    def get(self, key):
+        """Return value untuk key, atau None jika belum pernah disimpan"""
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            value = self.entries.get(key)
+            self.stats['hits' if value is not None else 'misses'] += 1
+            return value
+
+    def get_any(self, keys):
+        """Value key pertama (None dilewati) yang ada; dihitung satu hit/miss per panggilan"""
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            value = next((self.entries[key] for key in keys if key is not None and key in self.entries), None)
+            self.stats['hits' if value is not None else 'misses'] += 1
+            return value
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+        """Simpan banyak entry sekaligus (satu kali buka file log)"""
+        items = list(items)
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            for key, value in items:
+                self.entries[key] = value
+                self.versions[key] = self.data_version
+            self.stats['stores'] += len(items)
+            if not self.path or not items:
+                return
+            try:
+                with open(self.path, 'ab', buffering=0) as f:
+                    for key, value in items:
+                        # Satu write per record agar append dari proses lain tidak menyisip
+                        f.write(pickle.dumps((key, value, self.data_version), protocol=pickle.HIGHEST_PROTOCOL))
+            except OSError as e:
+                print(f"Gagal menyimpan result cache: {e}")
+
+    def clear(self):
+        """Hapus semua entry (memory dan disk)"""
+        with self.lock:
+            self.entries.clear()
+            self.versions.clear()
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Load test untuk bbfs_service: N client konkuren dengan koneksi keep-alive,
+laporkan throughput dan latency p50/p95/p99.
+
+Contoh:
+    python bbfs_service.py &
+    python service_load_test.py --clients 64 --requests 500
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+PATHS = ["/streak", "/summary", "/breakdown"]
+DAYS = ["senin", "selasa", "rabu", "kamis", "jumat", "sabtu", "minggu"]
+
+
+def _random_path(rng):
+    if rng.random() < 0.7:
+        return f"/predict?input={rng.randint(0, 9999):04d}&day={rng.choice(DAYS)}&loss_context={rng.randint(0, 9)}"
+    return rng.choice(PATHS)
+
+
+async def _client(host, port, n_requests, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    try:
+        for _ in range(n_requests):
+            request = f"GET {_random_path(rng)} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b""):
+                    break
+                if header.lower().startswith(b"content-length:"):
+                    length = int(header.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+
+            if b" 200 " not in status_line:
+                errors += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return errors
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+async def run(host, port, clients, requests_per_client):
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*[
+        _client(host, port, requests_per_client, latencies, seed) for seed in range(clients)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"Clients: {clients} | Requests: {total:,} | Errors: {sum(errors)}")
+    print(f"Throughput: {total / elapsed:,.0f} req/s dalam {elapsed:.2f}s")
+    for pct in (50, 95, 99):
+        print(f"p{pct}: {percentile(latencies, pct) * 1000:.2f} ms")
+    print(f"max: {latencies[-1] * 1000:.2f} ms" if latencies else "max: -")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test BBFS service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=500, help="Request per client")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.host, args.port, args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -59,6 +59,23 @@ def test_imports():
         print(f"❌ Import error: {e}")
         return False
 
+def build_warm_start_bundle():
+    """Build warm-start bundle (data, pola, ringkasan backtest) untuk cold start cepat"""
+    try:
+        from optimized_bbfs_system import OptimizedBBFSSystem, BUNDLE_PATH
+        
+        system = OptimizedBBFSSystem()
+        if not system.fetch_complete_data():
+            print("❌ Data tidak tersedia (sumber dan snapshot), bundle tidak dibuat")
+            return False
+        system.save_bundle(BUNDLE_PATH)
+        size_kb = os.path.getsize(BUNDLE_PATH) / 1024
+        print(f"✅ Warm-start bundle dibuat: {BUNDLE_PATH} ({len(system.data)} records, {size_kb:.0f} KB)")
+        return True
+    except Exception as e:
+        print(f"❌ Gagal membuat bundle: {e}")
+        return False
+
 def main():
     print("🔍 Checking deployment readiness...")
     print("=" * 50)
@@ -66,7 +83,8 @@ def main():
     checks = [
         ("Requirements", check_requirements),
         ("Files", check_files),
-        ("Imports", test_imports)
+        ("Imports", test_imports),
+        ("Warm-start bundle", build_warm_start_bundle)
     ]
     
     all_passed = True
@@ -82,6 +100,7 @@ def main():
         print("1. Upload to GitHub repository")
         print("2. Deploy on share.streamlit.io")
         print("3. Use requirements_streamlit.txt for dependencies")
+        print("4. Sertakan bbfs_bundle.pkl agar first render tidak menunggu network")
     else:
         print("❌ Deployment readiness check failed")
         print("Please fix the issues above before deploying")
@@ -0,0 +1,81 @@
+"""
+Single-flight: request refresh yang bersamaan dengan key sama digabung.
+
+Pemanggil pertama (leader) menjalankan fungsi; pemanggil lain yang datang
+selama leader berjalan menunggu dan menerima hasil yang sama. Dalam
+min_interval detik setelah selesai, pemanggil baru langsung menerima hasil
+terakhir (throttle) - atau nilai `throttled` jika diisi - tanpa menjalankan
+fungsi lagi.
+"""
+
+import threading
+import time
+
+_LAST = object()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Koordinator single-flight thread-safe dengan counter per key"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.calls = {}       # key -> _Call yang sedang berjalan
+        self.last = {}        # key -> (waktu selesai, hasil)
+        self.counters = {}    # key -> {'requests', 'executed', 'coalesced', 'throttled'}
+
+    def run(self, key, fn, min_interval=0, throttled=_LAST):
+        """Jalankan fn() sekali untuk semua pemanggil bersamaan dengan key yang sama.
+        
+        throttled: nilai return saat di-throttle (default hasil terakhir)
+        """
+        with self.lock:
+            counters = self.counters.setdefault(
+                key, {'requests': 0, 'executed': 0, 'coalesced': 0, 'throttled': 0}
+            )
+            counters['requests'] += 1
+            call = self.calls.get(key)
+            if call is not None:
+                counters['coalesced'] += 1
+                leader = False
+            else:
+                last = self.last.get(key)
+                if last is not None and self.clock() - last[0] < min_interval:
+                    counters['throttled'] += 1
+                    return last[1] if throttled is _LAST else throttled
+                call = self.calls[key] = _Call()
+                counters['executed'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+                if call.error is None:
+                    self.last[key] = (self.clock(), call.result)
+            call.done.set()
+        return call.result
+
+    def stats(self, key=None):
+        """Salinan counter (satu key atau semua)"""
+        with self.lock:
+            if key is not None:
+                return dict(self.counters.get(key, {}))
+            return {k: dict(v) for k, v in self.counters.items()}
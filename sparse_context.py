@@ -0,0 +1,114 @@
+"""
+Sparse higher-order context index: digit count berikutnya untuk konteks
+k draw terakhir (k = 1..max_order), opsional dikombinasikan dengan hari.
+
+Konteks di-pack menjadi integer (setiap 2D = satu digit basis 100, hari =
+basis 7) dan disimpan per order dalam dict -> baris di satu array count
+(N_konteks x 10). Memori sebanding dengan jumlah konteks yang benar-benar
+teramati; build dan update O(max_order) per draw.
+"""
+
+from collections import deque
+
+import numpy as np
+
+MAX_SUPPORTED_ORDER = 4
+_INITIAL_ROWS = 1024
+
+
+def _code(value):
+    """2D string ('07') atau int -> int 0..99"""
+    return int(value) if isinstance(value, str) else value
+
+
+class SparseContextIndex:
+    """Index konteks (last k 2D [+ hari]) -> digit count vector dengan backoff"""
+
+    def __init__(self, max_order=3, use_weekday=False):
+        if not 1 <= max_order <= MAX_SUPPORTED_ORDER:
+            raise ValueError(f"max_order harus 1..{MAX_SUPPORTED_ORDER}")
+        self.max_order = max_order
+        self.use_weekday = use_weekday
+        self.rows = [{} for _ in range(max_order + 1)]   # rows[k]: packed key -> baris counts
+        self.counts = np.zeros((_INITIAL_ROWS, 10), dtype=np.int32)
+        self.n_rows = 0
+        self.global_counts = np.zeros(10, dtype=np.int64)
+        self.draws = 0
+        self._history = deque(maxlen=max_order)
+        self._last_weekday = 0
+
+    def _keys(self, history, weekday):
+        """Yield (order, packed key) dari order 1 sampai len(history), most recent last"""
+        base = 0
+        scale = 1
+        for k in range(1, len(history) + 1):
+            base += history[-k] * scale
+            scale *= 100
+            yield k, (base * 7 + weekday if self.use_weekday else base)
+
+    def _new_row(self):
+        if self.n_rows == len(self.counts):
+            grown = np.zeros((len(self.counts) * 2, 10), dtype=np.int32)
+            grown[:self.n_rows] = self.counts
+            self.counts = grown
+        self.n_rows += 1
+        return self.n_rows - 1
+
+    def update(self, value, weekday=0):
+        """Tambahkan satu draw baru (2D + hari draw tersebut), O(max_order)"""
+        code = _code(value)
+        tens, ones = divmod(code, 10)
+        counts = self.counts
+        for k, key in self._keys(self._history, self._last_weekday):
+            row = self.rows[k].get(key)
+            if row is None:
+                row = self.rows[k][key] = self._new_row()
+                counts = self.counts
+            counts[row, tens] += 1
+            counts[row, ones] += 1
+        if self._history:
+            self.global_counts[tens] += 1
+            self.global_counts[ones] += 1
+
+        self._history.append(code)
+        self._last_weekday = weekday
+        self.draws += 1
+
+    def extend(self, values, weekdays=None):
+        """Build/extend dari urutan draw kronologis"""
+        if weekdays is None:
+            weekdays = [0] * len(values)
+        for value, weekday in zip(values, weekdays):
+            self.update(value, weekday)
+        return self
+
+    def lookup(self, recent, weekday=0, min_observations=1):
+        """Return (order, digit counts) untuk konteks terpanjang yang teramati.
+
+        recent: 2D terakhir (most recent last). Backoff ke order lebih rendah
+        jika konteks belum pernah muncul atau observasinya < min_observations;
+        order 0 berarti fallback ke global digit counts.
+        """
+        history = [_code(v) for v in list(recent)[-self.max_order:]]
+        found = (0, self.global_counts)
+        for k, key in self._keys(history, weekday):
+            row = self.rows[k].get(key)
+            if row is None or self.counts[row].sum() < 2 * min_observations:
+                break
+            found = (k, self.counts[row])
+        return found
+
+    def top_digits(self, recent, weekday=0, k=5, min_observations=1):
+        """Top-k digit dari konteks hasil lookup (stable: tie -> digit terkecil)"""
+        _, counts = self.lookup(recent, weekday, min_observations)
+        return [str(d) for d in np.argsort(-counts, kind='stable')[:k]]
+
+    def stats(self):
+        """Jumlah konteks per order dan perkiraan memori"""
+        dict_bytes = sum(len(r) * 100 for r in self.rows)  # perkiraan overhead entry dict
+        return {
+            'draws': self.draws,
+            'contexts_per_order': {k: len(self.rows[k]) for k in range(1, self.max_order + 1)},
+            'count_rows': self.n_rows,
+            'approx_bytes': int(self.counts[:self.n_rows].nbytes + dict_bytes)
+        }
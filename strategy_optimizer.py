@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Optimizer evolusioner atas ruang strategi BBFS terparameter (UltraSmartBBFS).
+
+Satu genome = bobot sumber skor (frekuensi transisi, pola hari, frekuensi
+global, digit input, digit komplemen), ukuran top-k setiap sumber kandidat
+dan threshold context score. Strategi deterministik: untuk genome tertentu
+BBFS semua (hari, input_2d) dihitung sekaligus sebagai tabel bitmask (7, 100),
+sehingga backtest hanya berupa lookup + operasi vektor.
+
+- Fitness cache di-key fingerprint kanonik parameter (gen dikuantisasi);
+  dengan ResultCache win flag backtest juga disimpan ke disk, di-key spec
+  fold (range data, split rolling-origin), versi data dan fingerprint kode,
+  sehingga run berikutnya tidak menghitung ulang genome yang sama
+- Populasi dievaluasi paralel (ProcessPoolExecutor)
+- Objective: win_rate_weight * win rate - loss_weight * max consecutive losses,
+  dihitung out-of-sample pada fold rolling-origin (tabel fold dari prefix data)
+- Racing: evaluasi berhenti begitu fitness tidak mungkin lagi menyamai best
+  (walau sisa draw menang semua), sehingga genome buruk hanya memakan
+  sedikit draw
+
+Dipakai juga sebagai UltraSmartBBFS.intensive_search(mode="evolutionary").
+
+Contoh:
+    python strategy_optimizer.py --snapshot bbfs_snapshot.json --generations 8 --folds 5
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cross_validation import rolling_origin_splits
+from multi_backtest import MASK_2D
+from optimized_bbfs_system import SNAPSHOT_PATH
+from result_cache import CACHE_PATH, ResultCache, code_fingerprint, fingerprint as cache_fingerprint
+from ultra_smart_bbfs import DAY_INDEX, DAYS, DIGIT_COUNTS, DIGIT_STRS, StrategyResults, UltraSmartBBFS
+
+# Nama gen -> (min, max, step kuantisasi); step 1 = gen integer
+GENES = {
+    'w_freq': (0.0, 2.0, 0.05),
+    'w_day': (0.0, 2.0, 0.05),
+    'w_global': (0.0, 2.0, 0.05),
+    'w_input': (0.0, 3.0, 0.05),
+    'w_complement': (0.0, 2.0, 0.05),
+    'context_threshold': (1.0, 2.0, 0.05),
+    'k_freq': (0, 10, 1),
+    'k_day': (0, 10, 1),
+    'k_global': (0, 10, 1),
+}
+BIT_VALUES = 1 << np.arange(10, dtype=np.uint16)
+
+
+def quantize(params):
+    """Bulatkan setiap gen ke grid-nya dan clip ke range (bentuk kanonik)"""
+    result = {}
+    for name, (low, high, step) in GENES.items():
+        value = min(max(params[name], low), high)
+        if step == 1:
+            result[name] = int(round(value))
+        else:
+            result[name] = round(round(value / step) * step, 4)
+    return result
+
+
+def fingerprint(params):
+    """Fingerprint kanonik parameter strategi (key fitness cache)"""
+    canonical = json.dumps(quantize(params), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def _top_k_mask(values, k):
+    """Mask top-k digit (nilai > 0) pada axis terakhir, tie -> digit terkecil"""
+    mask = np.zeros(values.shape, dtype=bool)
+    if k <= 0:
+        return mask
+    order = np.argsort(-values, axis=-1, kind='stable')[..., :k]
+    np.put_along_axis(mask, order, True, axis=-1)
+    return mask & (values > 0)
+
+
+def _score_components(system):
+    """Komponen skor (7 hari x 100 input x 10 digit) dari UltraSmartBBFS yang sudah dianalisis"""
+    if system.digit_frequency is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            system.deep_pattern_analysis()
+
+    def normalize(values):
+        values = values.astype(np.float64)
+        return values / np.maximum(values.max(axis=-1, keepdims=True), 1)
+
+    return {
+        'freq': normalize(system.digit_frequency),                            # (100, 10)
+        'day': normalize(system.day_patterns @ DIGIT_COUNTS),                 # (7, 100, 10)
+        'global_freq': normalize(system.digit_frequency.sum(axis=0)),         # (10,)
+        'context_score': np.array([
+            [system.calculate_context_score(f"{n:02d}", day) for n in range(100)] for day in DAYS
+        ])                                                                    # (7, 100)
+    }
+
+
+class StrategySpace:
+    """Komponen skor per fold + data backtest out-of-sample.
+
+    Fitness dihitung rolling-origin (cross_validation.rolling_origin_splits)
+    atas data[lo:hi]: fold f memakai komponen dari prefix data[:train_end_f]
+    dan diuji pada draw sesudahnya, sehingga genome tidak pernah dinilai pada
+    draw yang ikut membentuk tabelnya. Blok test fold berurutan tanpa celah,
+    jadi streak dihitung lintas fold. Komponen terakhir (index -1) dari
+    seluruh history, untuk strategi final (as_strategy).
+    """
+
+    def __init__(self, system, start=None, end=None, folds=5, min_train=None):
+        lo, hi = system.data_bounds(start, end)
+        if min_train is None:
+            min_train = (hi - lo) // 2
+        splits = rolling_origin_splits(hi - lo, folds, min_train)
+
+        components = []
+        step_fold, step_positions = [], []
+        for fold, (train_end, test_end) in enumerate(splits):
+            trainer = UltraSmartBBFS()
+            trainer.data = system.data[:lo + train_end]
+            components.append(_score_components(trainer))
+            # Input data[i] memprediksi data[i + 1] untuk target data[train_end:test_end]
+            positions = range(lo + train_end - 1, lo + test_end - 1)
+            step_fold.extend([fold] * len(positions))
+            step_positions.extend(positions)
+        components.append(_score_components(system))
+
+        self.folds = len(splits)
+        self.bounds = (lo, hi)
+        self.splits = splits
+        self.data_version = system.data_version
+        self.first_position = step_positions[0]
+        self.freq = np.stack([c['freq'] for c in components])                  # (F + 1, 100, 10)
+        self.day = np.stack([c['day'] for c in components])                    # (F + 1, 7, 100, 10)
+        self.global_freq = np.stack([c['global_freq'] for c in components])    # (F + 1, 10)
+        self.context_score = np.stack([c['context_score'] for c in components])  # (F + 1, 7, 100)
+        self.input_digits = DIGIT_COUNTS > 0                                  # (100, 10)
+        self.complement = np.zeros((100, 10), dtype=bool)
+        for n in range(100):
+            self.complement[n, (10 - n // 10) % 10] = self.complement[n, (10 - n % 10) % 10] = True
+
+        data = system.data
+        self.step_fold = np.array(step_fold, dtype=np.int64)
+        self.step_day = np.array([DAY_INDEX[data[i]['day']] for i in step_positions], dtype=np.int64)
+        self.step_input = np.array([int(data[i]['last_2d']) for i in step_positions], dtype=np.int64)
+        self.step_target = np.array([MASK_2D[data[i + 1]['last_2d']] for i in step_positions], dtype=np.uint16)
+
+    def build_table(self, params):
+        """Tabel bitmask BBFS (F + 1, 7, 100) untuk satu genome, satu per fold"""
+        p = quantize(params)
+        freq, global_freq = self.freq[:, None], self.global_freq[:, None, None]
+        complement = self.complement & (self.context_score > p['context_threshold'])[..., None]
+        score = (p['w_freq'] * freq + p['w_day'] * self.day + p['w_global'] * global_freq
+                 + p['w_input'] * self.input_digits + p['w_complement'] * complement)
+        candidates = (_top_k_mask(freq, p['k_freq']) | _top_k_mask(self.day, p['k_day'])
+                      | _top_k_mask(global_freq, p['k_global']) | self.input_digits | complement)
+
+        # Kandidat selalu di depan non-kandidat; stable sort -> tie ke digit terkecil
+        order = np.argsort(-(candidates * 1000.0 + score), axis=-1, kind='stable')[..., :5]
+        return BIT_VALUES[order].sum(axis=-1, dtype=np.uint16)
+
+    def backtest(self, params):
+        """(bitmask BBFS, win) per draw test out-of-sample untuk satu genome"""
+        masks = self.build_table(params)[self.step_fold, self.step_day, self.step_input]
+        return masks, (self.step_target & ~masks) == 0
+
+    def evaluate(self, params, objective=None, target=None, chunk=50):
+        """Backtest genome; berhenti begitu objective.upper_bound(...) < target (racing)"""
+        _, wins = self.backtest(params)
+        return self.race(wins, objective, target, chunk)
+
+    def race(self, wins, objective=None, target=None, chunk=50):
+        """Statistik win flag backtest per chunk; berhenti begitu fitness tidak bisa mencapai target"""
+        total = len(wins)
+        total_wins = 0
+        max_streak = 0
+        last_win = -1
+        evaluated = 0
+        for lo in range(0, total, chunk):
+            block = wins[lo:lo + chunk]
+            idx = np.arange(lo, lo + len(block))
+            last = np.maximum.accumulate(np.where(block, idx, last_win))
+            streak = idx - last
+            max_streak = max(max_streak, int(streak.max()))
+            total_wins += int(block.sum())
+            last_win = int(last[-1])
+            evaluated = lo + len(block)
+            if target is not None and objective.upper_bound(total_wins, evaluated, total, max_streak) < target:
+                break
+
+        return {
+            'total_tests': evaluated,
+            'wins': total_wins,
+            'win_rate': round(total_wins / evaluated * 100, 2) if evaluated else 0,
+            'max_consecutive_losses': max_streak,
+            'complete': evaluated == total
+        }
+
+    def cache_key(self, params):
+        """Key ResultCache win flag out-of-sample satu genome (spec fold + kode + parameter)"""
+        code = code_fingerprint(
+            _score_components, StrategySpace.__init__, StrategySpace.build_table, StrategySpace.backtest,
+            quantize, rolling_origin_splits,
+            UltraSmartBBFS.deep_pattern_analysis, UltraSmartBBFS.calculate_context_score
+        )
+        return cache_fingerprint(
+            'evolutionary', code, self.data_version, self.bounds, self.splits, fingerprint(params)
+        )
+    
+    def as_strategy(self, params):
+        """Callable (input_2d, day) -> list digit dari komponen seluruh history (prediksi ke depan)"""
+        table = self.build_table(params)[-1]
+
+        def strategy(input_2d, day):
+            mask = int(table[DAY_INDEX[day], int(input_2d)])
+            return [d for i, d in enumerate(DIGIT_STRS) if mask >> i & 1]
+        return strategy
+
+
+class Objective:
+    """Fitness = win_rate_weight * win rate (%) - loss_weight * max consecutive losses"""
+
+    def __init__(self, loss_weight=1.0, win_rate_weight=0.1):
+        self.loss_weight = loss_weight
+        self.win_rate_weight = win_rate_weight
+
+    def __call__(self, result):
+        if not result['complete']:
+            return float('-inf')  # dihentikan racing: pasti lebih buruk dari best
+        return self.win_rate_weight * result['win_rate'] - self.loss_weight * result['max_consecutive_losses']
+
+    def upper_bound(self, wins, evaluated, total, max_losses):
+        """Fitness maksimum yang masih mungkin jika semua draw sisa menang"""
+        best_win_rate = (wins + total - evaluated) / total * 100 if total else 0
+        return self.win_rate_weight * best_win_rate - self.loss_weight * max_losses
+
+
+# State worker proses (diisi initializer, agar StrategySpace tidak di-pickle per task)
+_worker_space = None
+
+
+def _init_worker(space):
+    global _worker_space
+    _worker_space = space
+
+
+def _backtest_job(params):
+    return _worker_space.backtest(params)[1]
+
+
+class EvolutionaryOptimizer:
+    """Genetic algorithm (tournament, uniform crossover, mutasi gaussian, elitism)"""
+
+    def __init__(self, space, objective=None, population=12, generations=8, elite=2,
+                 mutation_rate=0.3, workers=None, seed=None, result_cache=None):
+        self.space = space
+        self.objective = objective or Objective()
+        self.population = population
+        self.generations = generations
+        self.elite = elite
+        self.mutation_rate = mutation_rate
+        self.workers = workers or min(population, os.cpu_count() or 1)
+        self.rng = np.random.default_rng(seed)
+        self.cache = {}  # fingerprint -> (params, result, fitness)
+        self.result_cache = result_cache  # ResultCache (disk) untuk win flag backtest, opsional
+        self.stats = {'evaluations': 0, 'cache_hits': 0, 'result_cache_hits': 0, 'draws_evaluated': 0}
+
+    def random_genome(self):
+        return quantize({
+            name: self.rng.integers(low, high + 1) if step == 1 else self.rng.uniform(low, high)
+            for name, (low, high, step) in GENES.items()
+        })
+
+    def crossover(self, a, b):
+        return {name: a[name] if self.rng.random() < 0.5 else b[name] for name in GENES}
+
+    def mutate(self, genome):
+        child = dict(genome)
+        for name, (low, high, step) in GENES.items():
+            if self.rng.random() < self.mutation_rate:
+                child[name] += self.rng.normal(0, max((high - low) * 0.15, step))
+        return quantize(child)
+
+    def evaluate_population(self, genomes, pool=None):
+        """Fitness per genome; genome yang fingerprint-nya sudah ada diambil dari cache.
+
+        Win flag backtest genome baru diambil dari result cache jika ada,
+        selebihnya dihitung (paralel) lalu disimpan. Racing selalu dijalankan
+        ulang atas win flag dengan target run ini, sehingga hasil dari cache
+        sama persis dengan evaluasi baru.
+        """
+        target = self.best()['fitness'] if self.cache else None
+        pending = {}
+        for genome in genomes:
+            key = fingerprint(genome)
+            if key in self.cache or key in pending:
+                self.stats['cache_hits'] += 1
+            else:
+                pending[key] = genome
+
+        wins = {}
+        if self.result_cache is not None:
+            for key, genome in pending.items():
+                packed = self.result_cache.get(self.space.cache_key(genome))
+                if packed is not None:
+                    wins[key] = np.unpackbits(packed, count=len(self.space.step_target)).astype(bool)
+            self.stats['result_cache_hits'] += len(wins)
+
+        jobs = {key: genome for key, genome in pending.items() if key not in wins}
+        if pool is not None:
+            computed = list(pool.map(_backtest_job, jobs.values()))
+        else:
+            computed = [self.space.backtest(genome)[1] for genome in jobs.values()]
+        wins.update(zip(jobs, computed))
+        self.stats['evaluations'] += len(jobs)
+        if self.result_cache is not None and jobs:
+            self.result_cache.put_many(
+                (self.space.cache_key(genome), np.packbits(flags)) for genome, flags in zip(jobs.values(), computed)
+            )
+
+        for key, genome in pending.items():
+            result = self.space.race(wins[key], self.objective, target)
+            self.cache[key] = (genome, result, self.objective(result))
+            self.stats['draws_evaluated'] += result['total_tests']
+
+        return [self.cache[fingerprint(genome)][2] for genome in genomes]
+
+    def _tournament(self, genomes, fitness, size=3):
+        picks = self.rng.integers(0, len(genomes), size)
+        return genomes[max(picks, key=lambda i: fitness[i])]
+
+    def run(self, verbose=True):
+        """Jalankan GA; return dict best (params, fingerprint, result, fitness) + stats"""
+        genomes = [self.random_genome() for _ in range(self.population)]
+
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.space,))
+        try:
+            for generation in range(1, self.generations + 1):
+                fitness = self.evaluate_population(genomes, pool)
+                ranked = sorted(range(len(genomes)), key=lambda i: fitness[i], reverse=True)
+                if verbose:
+                    best = self.best()
+                    print(f"Generasi {generation:2d}: best fitness {best['fitness']:.2f} "
+                          f"(max loss {best['result']['max_consecutive_losses']}, win {best['result']['win_rate']}%), "
+                          f"evaluasi {self.stats['evaluations']}, cache hit {self.stats['cache_hits']}, "
+                          f"result cache hit {self.stats['result_cache_hits']}")
+
+                next_genomes = [genomes[i] for i in ranked[:self.elite]]
+                while len(next_genomes) < self.population:
+                    child = self.crossover(self._tournament(genomes, fitness), self._tournament(genomes, fitness))
+                    next_genomes.append(self.mutate(child))
+                genomes = next_genomes
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return {**self.best(), 'stats': dict(self.stats)}
+
+    def best(self):
+        key, (params, result, fitness) = max(self.cache.items(), key=lambda item: item[1][2])
+        return {'params': params, 'fingerprint': key, 'result': result, 'fitness': fitness}
+
+
+def evolutionary_search(system, generations=8, population=12, seed=None, start=None, end=None,
+                        folds=5, min_train=None, workers=None, objective=None, max_allowed_losses=5,
+                        cache=None, verbose=True):
+    """Mode "evolutionary" UltraSmartBBFS.intensive_search.
+
+    Dengan cache (default system.result_cache) backtest genome yang sudah
+    pernah dihitung untuk spec fold dan data yang sama dipakai ulang.
+    Return (performance format test_strategy_rigorously dari backtest
+    out-of-sample genome terbaik, strategi final dari seluruh history).
+    """
+    cache = system.result_cache if cache is None else cache
+    if cache is not None:
+        cache.compact(system.data_version)
+    space = StrategySpace(system, start, end, folds, min_train)
+    optimizer = EvolutionaryOptimizer(
+        space, objective, population=population, generations=generations, workers=workers, seed=seed,
+        result_cache=cache
+    )
+    best = optimizer.run(verbose)
+
+    masks, wins = space.backtest(best['params'])
+    idx = np.arange(len(wins))
+    streak = idx - np.maximum.accumulate(np.where(wins, idx, -1))
+    results = StrategyResults(system.data, len(wins), space.first_position)
+    results.win[:] = wins
+    results.bbfs_mask[:] = masks
+    results.streak[:] = streak
+    results.size = len(wins)
+    performance = system._strategy_performance(
+        f"Evolutionary_{best['fingerprint']}", results, wins.sum(), streak.max(initial=0), max_allowed_losses, verbose
+    )
+    performance['params'] = best['params']
+    performance['optimizer_stats'] = best['stats']
+    return performance, space.as_strategy(best['params'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimizer evolusioner strategi BBFS")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="Path snapshot data lokal")
+    parser.add_argument("--population", type=int, default=12)
+    parser.add_argument("--generations", type=int, default=8)
+    parser.add_argument("--folds", type=int, default=5, help="Jumlah fold rolling-origin untuk fitness")
+    parser.add_argument("--min-train", type=int, default=None, help="Ukuran training fold pertama (default: setengah data)")
+    parser.add_argument("--loss-weight", type=float, default=1.0, help="Bobot max consecutive losses")
+    parser.add_argument("--win-rate-weight", type=float, default=0.1, help="Bobot win rate (per persen)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default=CACHE_PATH, help="Path result cache (string kosong = tanpa cache disk)")
+    args = parser.parse_args(argv)
+
+    system = UltraSmartBBFS(seed=args.seed)
+    if not system.load_snapshot(args.snapshot):
+        raise SystemExit(f"Gagal memuat snapshot {args.snapshot}")
+    system.result_cache = ResultCache(args.cache or None)
+
+    performance, _ = evolutionary_search(
+        system, generations=args.generations, population=args.population, seed=args.seed,
+        folds=args.folds, min_train=args.min_train, workers=args.workers,
+        objective=Objective(args.loss_weight, args.win_rate_weight), verbose=False
+    )
+    stats = performance['optimizer_stats']
+    print(f"\nBest {performance['strategy_name']}: max loss {performance['max_consecutive_losses']}, "
+          f"win rate {performance['win_rate']}% ({performance['total_tests']} test out-of-sample)")
+    print(f"Parameter: {json.dumps(performance['params'])}")
+    print(f"Evaluasi: {stats['evaluations']} genome, {stats['cache_hits']} cache hit, "
+          f"{stats['result_cache_hits']} result cache hit, {stats['draws_evaluated']:,} draw dievaluasi")
+
+
+if __name__ == "__main__":
+    main()
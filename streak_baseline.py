@@ -0,0 +1,100 @@
+"""
+Baseline analitik loss streak untuk BBFS acak.
+
+BBFS acak berisi `size` digit menang jika semua digit berbeda dari 2D ada
+di dalamnya: peluang C(10 - d, size - d) / C(10, size) untuk d digit
+berbeda. Untuk N trial independen dengan peluang win p, distribusi exact
+longest losing run M dihitung dengan dynamic program O(N·L):
+
+    a_k(n) = P(M_n <= k) = a_k(n-1) - p·q^(k+1)·a_k(n-k-2)
+
+(streak k+1 pertama selesai di trial n: k+1 loss didahului win), untuk
+semua k sekaligus sebagai vektor. Histogram streak yang diharapkan punya
+bentuk tertutup; keduanya menggantikan simulasi untuk menjawab "apakah
+streak ini tidak biasa?".
+"""
+
+from math import comb
+
+import numpy as np
+
+
+def random_bbfs_win_probability(two_digits, size=5):
+    """Peluang BBFS acak ukuran size menang, rata-rata atas daftar 2D target"""
+    chances = [comb(10 - len(set(d)), size - len(set(d))) / comb(10, size) for d in two_digits]
+    return sum(chances) / len(chances) if chances else 0.0
+
+
+def longest_run_distribution(n, win_probability, max_length=None, tol=1e-12, min_length=0):
+    """Distribusi exact longest losing run dalam n trial: pmf[k] = P(M = k).
+
+    max_length: panjang maksimum yang dihitung (default: sampai P(M > L) < tol,
+    minimal min_length); massa di atasnya ada di 1 - pmf.sum().
+    """
+    p = win_probability
+    q = 1.0 - p
+    if p <= 0:
+        pmf = np.zeros(n + 1)
+        pmf[n] = 1.0  # semua trial kalah
+        return pmf
+    if max_length is None:
+        # Batas atas kasar: P(M > L) <= n·q^(L+1)
+        max_length = 0 if n * q < tol else int(np.ceil(np.log(tol / n) / np.log(q)))
+        max_length = min(n, max(max_length, min_length))
+    lengths = np.arange(max_length + 1)
+    decay = p * q ** (lengths + 1)
+
+    # a[j, k] = P(M_(j-1) <= k); baris 0 = trial "-1" bernilai 1/p, agar streak
+    # yang dimulai di trial pertama (tanpa win sebelumnya) ikut rumus yang sama
+    a = np.ones((n + 2, max_length + 1))
+    a[0] = 1.0 / p
+    for trial in range(1, n + 1):
+        row = trial + 1
+        back = row - lengths - 2          # index a_k(trial-k-2)
+        valid = back >= 0
+        a[row] = a[row - 1]
+        a[row, valid] -= decay[valid] * a[back[valid], lengths[valid]]
+
+    cdf = a[n + 1]
+    return np.diff(cdf, prepend=0.0)
+
+
+def expected_streak_histogram(n, win_probability, max_length):
+    """Jumlah loss streak (maksimal, termasuk yang terbuka di akhir) yang diharapkan per panjang 1..max_length"""
+    p = win_probability
+    q = 1.0 - p
+    k = np.arange(1, max_length + 1)
+    # Streak di tengah (dibatasi win di kedua sisi) + di awal/akhir history
+    expected = (np.maximum(n - k - 1, 0) * p * p + 2 * p * (k < n)) * q ** k
+    return np.where(k == n, q ** n, expected)
+
+
+def streak_baseline(n, win_probability, observed_max=None, max_length=None):
+    """Ringkasan baseline: distribusi max streak, ekspektasi, p-value dan histogram.
+
+    Tanpa max_length, DP diperpanjang sampai observed_max sehingga p-value
+    tetap exact walau observed_max di atas truncation tol. Dengan max_length
+    < observed_max, P(M >= observed) memakai massa ekor 1 - cdf[L] (batas atas).
+    """
+    pmf = longest_run_distribution(n, win_probability, max_length, min_length=observed_max or 0)
+    cdf = np.cumsum(pmf)
+    lengths = np.arange(len(pmf))
+    result = {
+        'trials': n,
+        'win_probability': win_probability,
+        'max_streak_pmf': pmf,
+        'expected_max_streak': float((lengths * pmf).sum()),
+        'median_max_streak': int(np.searchsorted(cdf, 0.5)),
+        'expected_histogram': {
+            length: float(count)
+            for length, count in enumerate(expected_streak_histogram(n, win_probability, len(pmf) - 1), start=1)
+        }
+    }
+    if observed_max is not None:
+        # Kecil = max streak observasi tidak biasa (terlalu panjang / terlalu pendek) dibanding baseline
+        last = len(cdf) - 1
+        at_most = float(cdf[min(observed_max, last)])
+        at_least = float(max(0.0, 1.0 - cdf[min(observed_max - 1, last)])) if observed_max > 0 else 1.0
+        result['p_at_least_observed'] = min(at_least, 1.0)
+        result['p_at_most_observed'] = min(at_most, 1.0)
+    return result
@@ -0,0 +1,75 @@
+"""
+Live loss-streak tracker untuk OptimizedBBFSSystem.
+
+Tracker di-update sekali per draw (oleh backtest atau saat draw baru
+di-ingest) dan membawa loss context yang sama dengan backtest ledger,
+sehingga "current streak" bisa dijawab O(1) tanpa batas panjang streak.
+
+Tracker juga menjadi checkpoint backtest di akhir history (total, max
+streak, histogram streak + versi pola yang dipakai): draw baru cukup
+dievaluasi dari posisi terakhir, tanpa mengulang backtest penuh.
+"""
+
+from array import array
+from collections import Counter
+
+
+class LossStreakTracker:
+    """State streak aktif: jumlah loss beruntun + detail setiap loss-nya"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.position = 0             # index input berikutnya yang belum diproses
+        self.consecutive_losses = 0   # juga loss context untuk prediksi berikutnya
+        self.details = []             # detail loss pada streak aktif (kronologis)
+        self.last_result = None       # (date, is_win) transisi terakhir
+        self.pattern_version = None   # versi optimization_cache yang dipakai ledger
+        self.total_tests = 0
+        self.total_wins = 0
+        self.max_consecutive = 0
+        self.loss_streaks = []        # streak yang sudah selesai (kronologis)
+        self.streak_histogram = Counter()
+        self.outcomes = bytearray()   # 1 = win per transisi (vektor untuk bootstrap)
+        self.positions = array('l')   # index input data per transisi (untuk chart)
+
+    def record(self, i, current, next_item, bbfs, is_win):
+        """Catat hasil transisi data[i] -> data[i + 1], O(1)"""
+        self.total_tests += 1
+        self.outcomes.append(is_win)
+        self.positions.append(i)
+        if is_win:
+            self.total_wins += 1
+            if self.consecutive_losses > 0:
+                self.loss_streaks.append(self.consecutive_losses)
+                self.streak_histogram[self.consecutive_losses] += 1
+            self.consecutive_losses = 0
+            self.details = []
+        else:
+            self.consecutive_losses += 1
+            self.max_consecutive = max(self.max_consecutive, self.consecutive_losses)
+            self.details.append({
+                'date': current['date'],
+                'input_result': current['result'],
+                'actual_result': next_item['result'],
+                'input_2d': current['last_2d'],
+                'actual_2d': next_item['last_2d'],
+                'bbfs_used': ''.join(bbfs),
+                'day': current['day'],
+                'loss_number': self.consecutive_losses
+            })
+        self.position = i + 1
+        self.last_result = (next_item['date'], is_win)
+
+    def snapshot(self, limit=None):
+        """Return (current streak, salinan detail); limit = jumlah detail terbaru"""
+        # Bukan details[-limit:]: limit 0 harus kosong, bukan seluruh detail
+        details = self.details if limit is None else self.details[max(len(self.details) - limit, 0):]
+        return self.consecutive_losses, list(details)
+
+    def all_loss_streaks(self):
+        """Semua streak termasuk streak yang masih terbuka (format loss_streaks backtest)"""
+        if self.consecutive_losses > 0:
+            return self.loss_streaks + [self.consecutive_losses]
+        return list(self.loss_streaks)
@@ -0,0 +1,59 @@
+"""
+Copy-on-write store untuk state engine yang dipakai bersama banyak session.
+
+Reader mengambil `store.current` sekali per render dan memakai objek itu
+sampai selesai; objek yang sudah dipublish tidak pernah dimutasi lagi.
+Writer (refresh) bekerja pada clone, lalu mempublish clone itu dengan satu
+assignment referensi (atomik di CPython) - reader tidak butuh lock dan
+tidak pernah melihat state setengah jadi.
+
+Refresh dari banyak session digabung lewat SingleFlight milik store
+(satu fetch+rebuild per key, pemanggil lain menerima hasil yang sama).
+"""
+
+import threading
+
+from single_flight import SingleFlight
+
+
+class SnapshotStore:
+    """Referensi ke snapshot terbaru + serialisasi writer"""
+
+    def __init__(self, initial, prepare=None):
+        self._current = initial
+        self.prepare = prepare          # dipanggil pada clone sebelum publish
+        self.write_lock = threading.Lock()
+        self.version = 0                # naik setiap publish
+        self.flight = SingleFlight()    # dedup refresh bersamaan, dibagi semua session
+        self.listeners = []             # callable(snapshot) setelah publish, mis. MemoryMonitor.record
+
+    @property
+    def current(self):
+        return self._current
+
+    def publish(self, snapshot):
+        if self.prepare is not None:
+            self.prepare(snapshot)
+        self._current = snapshot
+        self.version += 1
+        for listener in self.listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"Listener publish gagal: {e}")
+        return snapshot
+
+    def update(self, mutate):
+        """Clone snapshot sekarang, jalankan mutate(clone), publish jika mutate return truthy.
+
+        Return (published, snapshot yang berlaku setelah update).
+        """
+        with self.write_lock:
+            draft = self._current.clone()
+            if not mutate(draft):
+                return False, self._current
+            return True, self.publish(draft)
+
+    def refresh(self, key, mutate, min_interval=0):
+        """update() lewat single-flight: refresh bersamaan dengan key sama hanya jalan sekali"""
+        return self.flight.run(key, lambda: self.update(mutate), min_interval)
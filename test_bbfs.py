@@ -0,0 +1,289 @@
+"""
+Test regresi engine BBFS (pytest).
+
+Data draw dibuat sintetis dengan seed tetap, sehingga test tidak butuh
+snapshot lokal maupun network.
+"""
+
+import contextlib
+import io
+import itertools
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import bbfs_cli
+from bbfs_rng import PermutationStream
+from optimized_bbfs_system import OptimizedBBFSSystem
+from result_cache import ResultCache
+from streak_baseline import longest_run_distribution, streak_baseline
+from streak_tracker import LossStreakTracker
+from ultra_smart_bbfs import DAYS, UltraSmartBBFS
+
+N_DRAWS = 600
+DAY_NAMES = ['senin', 'selasa', 'rabu', 'kamis', 'jumat', 'sabtu', 'minggu']
+
+
+def _draws(n=N_DRAWS, seed=7):
+    """(tanggal, nama hari, result 4D) harian sintetis"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2021, 1, 4)  # senin
+    return [
+        (start + timedelta(days=i), DAY_NAMES[i % 7], f"{int(result):04d}")
+        for i, result in enumerate(rng.integers(0, 10000, n))
+    ]
+
+
+def _quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _html(draws):
+    """Markup sumber minimal untuk OptimizedBBFSSystem.parse_content"""
+    return ''.join(f'<td title="{day}={date:%Y-%m-%d}=x">{result}</td>' for date, day, result in draws)
+
+
+def _ingested_system(draws):
+    system = OptimizedBBFSSystem(min_year=2000, min_records=2)
+    _quiet(system.ingest_content, _html(draws))
+    _quiet(system.freeze)
+    return system
+
+
+def _optimized_system(draws):
+    system = OptimizedBBFSSystem(min_year=2000, min_records=2)
+    system.data = [system._make_record(date, day, result) for date, day, result in draws]
+    system._index_data()
+    return system
+
+
+def _ultra_system(draws, seed=11):
+    system = UltraSmartBBFS(seed=seed, min_year=2000, min_records=2)
+    system.data = [system._make_record(date, system.standardize_day(day), result) for date, day, result in draws]
+    system._index_data()
+    _quiet(system.deep_pattern_analysis)
+    return system
+
+
+def _brute_force_longest_run(n, p):
+    """pmf longest losing run dengan enumerasi 2^n urutan win/loss"""
+    pmf = np.zeros(n + 1)
+    for outcome in itertools.product((True, False), repeat=n):
+        wins = sum(outcome)
+        longest = streak = 0
+        for is_win in outcome:
+            streak = 0 if is_win else streak + 1
+            longest = max(longest, streak)
+        pmf[longest] += p ** wins * (1 - p) ** (n - wins)
+    return pmf
+
+
+@pytest.mark.parametrize("n, p", [(1, 0.3), (6, 0.5), (11, 0.25), (12, 0.8)])
+def test_longest_run_dp_matches_brute_force(n, p):
+    assert np.allclose(longest_run_distribution(n, p, max_length=n), _brute_force_longest_run(n, p))
+
+
+def test_streak_baseline_p_values_match_brute_force():
+    n, p = 12, 0.3
+    pmf = _brute_force_longest_run(n, p)
+    for observed in range(n + 1):
+        result = streak_baseline(n, p, observed)
+        assert result['p_at_least_observed'] == pytest.approx(pmf[observed:].sum(), abs=1e-12)
+        assert result['p_at_most_observed'] == pytest.approx(pmf[:observed + 1].sum(), abs=1e-12)
+
+
+@pytest.mark.parametrize("n, p, observed", [(1996, 0.99, 12), (100, 0.5, 80), (30, 0.9, 30)])
+def test_streak_baseline_observed_above_truncation(n, p, observed):
+    # Truncation default (tol) lebih pendek dari observed_max: DP diperpanjang
+    assert len(longest_run_distribution(n, p)) - 1 < observed
+    result = streak_baseline(n, p, observed)
+    assert len(result['max_streak_pmf']) - 1 >= observed
+    assert 0.0 <= result['p_at_least_observed'] < 1e-6
+    assert result['p_at_most_observed'] == pytest.approx(1.0)
+
+
+def test_streak_baseline_explicit_truncation_uses_tail_mass():
+    n, p, observed = 100, 0.5, 80
+    truncated = streak_baseline(n, p, observed, max_length=10)
+    tail = 1.0 - truncated['max_streak_pmf'].sum()
+    assert truncated['p_at_least_observed'] == pytest.approx(tail)
+    assert truncated['p_at_least_observed'] >= streak_baseline(n, p, observed)['p_at_least_observed']
+
+
+@pytest.mark.parametrize("limit, expected", [(None, [1, 2, 3]), (0, []), (2, [2, 3]), (5, [1, 2, 3])])
+def test_streak_tracker_snapshot_limit(limit, expected):
+    tracker = LossStreakTracker()
+    record = {'date': datetime(2021, 1, 4), 'result': '1234', 'last_2d': '34', 'day': 'senin'}
+    for i in range(3):
+        tracker.record(i, record, record, ['1', '2'], False)
+    streak, details = tracker.snapshot(limit)
+    assert streak == 3
+    assert [item['loss_number'] for item in details] == expected
+
+
+def test_suffix_backtest_matches_full_recompute():
+    draws = _draws()
+    full = _optimized_system(draws)
+    _quiet(full.build_optimization_patterns)
+    expected = _quiet(full.test_comprehensive_performance)
+
+    # Pola sama, ledger dibangun dari checkpoint lalu hanya draw baru yang dievaluasi
+    incremental = _optimized_system(draws[:-25])
+    incremental.optimization_cache = full.optimization_cache
+    _quiet(incremental.run_performance_test)
+    incremental.data = full.data
+    incremental._index_data()
+    actual = _quiet(incremental.run_performance_test)
+
+    for key in ('total_tests', 'total_wins', 'win_rate', 'max_consecutive_loss', 'loss_streaks', 'meets_target'):
+        assert actual[key] == expected[key], key
+    assert [r['is_win'] for r in actual['results']] == [r['is_win'] for r in expected['results']]
+    assert incremental.streak_tracker.outcomes == full.streak_tracker.outcomes
+    assert incremental.streak_tracker.consecutive_losses == full.streak_tracker.consecutive_losses
+
+
+@pytest.mark.parametrize("strategy_type", ["ultra", "defensive", "aggressive", "balanced"])
+def test_multi_backtest_matches_rigorous_test(strategy_type):
+    system = _ultra_system(_draws())
+    seed = 5
+    batch = _quiet(
+        system.test_strategies_batch,
+        [(strategy_type, lambda context, loss_context, stream=PermutationStream.spawn(seed, strategy_type):
+          system.apply_strategy(strategy_type, context, stream))],
+        verbose=False
+    )[0]
+    stream = PermutationStream.spawn(seed, strategy_type)
+    rigorous = _quiet(
+        system.test_strategy_rigorously,
+        lambda input_2d, day: system.generate_smart_bbfs(input_2d, day, strategy_type, stream), strategy_type
+    )
+
+    for key in ('total_tests', 'wins', 'win_rate', 'max_consecutive_losses', 'meets_criteria'):
+        assert batch[key] == rigorous[key], key
+    assert list(batch['results']) == list(rigorous['results'])
+
+
+def test_seeded_intensive_search_is_deterministic():
+    draws = _draws()
+    first = _quiet(_ultra_system(draws, seed=3).intensive_search, 4)
+    second = _quiet(_ultra_system(draws, seed=3).intensive_search, 4)
+    assert first['strategy_name'] == second['strategy_name']
+    assert list(first['results']) == list(second['results'])
+
+
+def test_cached_intensive_search_matches_uncached():
+    draws = _draws()
+    cache = ResultCache(path=None)
+    runs = []
+    for result_cache in (None, cache, cache):  # tanpa cache, cache kosong, cache hit
+        system = _ultra_system(draws, seed=3)
+        performance = _quiet(system.intensive_search, 4, cache=result_cache)
+        predictions = [system.best_strategy(f"{n:02d}", day) for day in DAYS for n in range(100)]
+        runs.append((performance, predictions))
+    assert cache.stats['hits'] > 0
+    (expected, expected_predictions), *cached_runs = runs
+    for performance, predictions in cached_runs:
+        assert performance['strategy_name'] == expected['strategy_name']
+        assert list(performance['results']) == list(expected['results'])
+        assert predictions == expected_predictions
+
+
+def test_seeded_evolutionary_search_is_deterministic():
+    draws = _draws()
+    runs = []
+    for _ in range(2):
+        system = _ultra_system(draws, seed=3)
+        performance = _quiet(system.intensive_search, 3, mode="evolutionary", workers=1)
+        runs.append((performance, system.best_strategy))
+    (first, first_strategy), (second, second_strategy) = runs
+    assert first['params'] == second['params']
+    assert list(first['results']) == list(second['results'])
+    assert first_strategy('12', 'Senin') == second_strategy('12', 'Senin')
+
+
+def test_evolutionary_search_reuses_result_cache():
+    draws = _draws()
+    cache = ResultCache(path=None)
+    runs = []
+    for result_cache in (None, cache, cache):  # tanpa cache, cache kosong, cache hit
+        system = _ultra_system(draws, seed=3)
+        performance = _quiet(system.intensive_search, 3, mode="evolutionary", workers=1, cache=result_cache)
+        runs.append((performance, system.best_strategy('12', 'Senin')))
+    (expected, expected_prediction), *cached_runs = runs
+    assert cached_runs[-1][0]['optimizer_stats']['evaluations'] == 0
+    assert cached_runs[-1][0]['optimizer_stats']['result_cache_hits'] > 0
+    for performance, prediction in cached_runs:
+        assert performance['params'] == expected['params']
+        assert list(performance['results']) == list(expected['results'])
+        assert prediction == expected_prediction
+
+
+def test_ingest_append_does_not_touch_published_patterns():
+    draws = _draws()
+    published = _ingested_system(draws[:500])
+    patterns = published.optimization_cache
+    sizes = {key: len(value) for key, value in patterns['input_patterns'].items()}
+
+    draft = published.clone()
+    _quiet(draft.ingest_content, _html(draws[:520]))
+    assert draft.optimization_cache['built_until'] == 520
+    assert draft.pattern_version == published.pattern_version
+    assert patterns['built_until'] == 500
+    assert {key: len(value) for key, value in patterns['input_patterns'].items()} == sizes
+
+
+@pytest.mark.parametrize("rewrite", ["shifted_window", "corrected_old_draw"])
+def test_ingest_rewritten_history_rebuilds_patterns(rewrite):
+    draws = _draws()
+    old = _ingested_system(draws[:500])
+    if rewrite == "shifted_window":
+        new_draws = draws[50:550]
+    else:
+        date, day, result = draws[100]
+        new_draws = draws[:100] + [(date, day, f"{(int(result) + 1) % 10000:04d}")] + draws[101:510]
+
+    draft = old.clone()
+    _quiet(draft.ingest_content, _html(new_draws))
+    _quiet(draft.freeze)
+    fresh = _ingested_system(new_draws)
+
+    assert draft.pattern_version == old.pattern_version + 1
+    assert draft.optimization_cache['built_until'] == len(new_draws)
+    for key in ('total_tests', 'total_wins', 'max_consecutive_loss', 'loss_streaks'):
+        assert draft.performance_data[key] == fresh.performance_data[key], key
+    assert draft.streak_tracker.outcomes == fresh.streak_tracker.outcomes
+
+
+@pytest.mark.parametrize("engine", [OptimizedBBFSSystem, UltraSmartBBFS])
+def test_load_snapshot_skips_malformed_rows(engine, tmp_path):
+    good = [
+        {'date': f"{date:%Y-%m-%d}", 'day': day, 'result': result} for date, day, result in _draws(5)
+    ]
+    malformed = [
+        {'date': '2021-02-01', 'day': 'senin'},                     # result hilang
+        {'date': '2021-02-02', 'day': 'selasa', 'result': '12a4'},
+        {'date': '2021-02-03', 'day': 'rabu', 'result': '12345'},
+        {'date': '2021-02-04', 'day': 'kamis', 'result': '\u0661\u0662\u0663\u0664'},  # digit Unicode
+        {'date': '2021-02-05', 'day': 'jumat', 'result': 1234},
+        {'day': 'sabtu', 'result': '1234'},                          # date hilang
+        'bukan-dict',
+    ]
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps({'records': good + malformed}), encoding='utf-8')
+
+    system = engine(min_year=2000)
+    assert _quiet(system.load_snapshot, str(path))
+    assert [item['result'] for item in system.data] == [row['result'] for row in good]
+    assert system.features.digits.shape == (len(good), 4)
+
+
+def test_cli_stream_counts_only_output_rows():
+    lookup = {'12senin': '12,senin,OUT\n', '34selasa': '34,selasa,OUT\n'}
+    infile = io.StringIO("12,senin\n\n  \r\n1a,rabu\n\n34,selasa")
+    outfile = io.StringIO()
+    total, invalid = bbfs_cli.stream(infile, outfile, lookup)
+    assert outfile.getvalue() == "12,senin,OUT\n1a,rabu,ERROR\n34,selasa,OUT\n"
+    assert (total, invalid) == (3, 1)
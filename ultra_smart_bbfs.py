@@ -1,23 +1,114 @@
 import requests
 import re
 from datetime import datetime
-import random
 import json
 from collections import defaultdict, Counter
 import itertools
 import time
 import math
+import hashlib
+
+import numpy as np
+
+from bbfs_rng import PermutationStream
+from date_index import DateIndex
+from feature_index import DigitFeatureIndex
+from multi_backtest import DIGIT_BITS, MASK_2D, multi_strategy_backtest
+from optimized_bbfs_system import RESULT_PATTERN, SNAPSHOT_PATH, DEFAULT_MIN_YEAR
+from result_cache import ResultCache, code_fingerprint, fingerprint
+from sparse_context import SparseContextIndex
+
+DAYS = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+DAY_MAP = {
+    'senin': 'Senin', 'monday': 'Senin', 'mon': 'Senin',
+    'selasa': 'Selasa', 'tuesday': 'Selasa', 'tue': 'Selasa',
+    'rabu': 'Rabu', 'wednesday': 'Rabu', 'wed': 'Rabu',
+    'kamis': 'Kamis', 'thursday': 'Kamis', 'thu': 'Kamis',
+    'jumat': 'Jumat', 'friday': 'Jumat', 'fri': 'Jumat',
+    'sabtu': 'Sabtu', 'saturday': 'Sabtu', 'sat': 'Sabtu',
+    'minggu': 'Minggu', 'sunday': 'Minggu', 'sun': 'Minggu'
+}
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+DIGIT_STRS = [str(d) for d in range(10)]
+
+# DIGIT_COUNTS[n, d] = berapa kali digit d muncul di 2D n (mis. "33" -> 2x digit 3)
+DIGIT_COUNTS = np.zeros((100, 10), dtype=np.int32)
+for _n in range(100):
+    DIGIT_COUNTS[_n, _n // 10] += 1
+    DIGIT_COUNTS[_n, _n % 10] += 1
+
+
+class StrategyResults:
+    """Recorder kolumnar untuk test_strategy_rigorously.
+    
+    Menyimpan win flag, bitmask BBFS dan consecutive losses per test dalam
+    array preallocated; baris dict (format lama) dibuat on demand lewat
+    indexing/slicing, mis. ``results[-25:]``.
+    """
+    
+    def __init__(self, data, capacity, offset=0):
+        self.data = data
+        self.offset = offset  # posisi data untuk test pertama
+        self.win = np.zeros(capacity, dtype=bool)
+        self.bbfs_mask = np.zeros(capacity, dtype=np.uint16)
+        self.streak = np.zeros(capacity, dtype=np.int32)
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def __iter__(self):
+        return (self.row(i) for i in range(self.size))
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.row(i) for i in range(*key.indices(self.size))]
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError("result index out of range")
+        return self.row(key)
+    
+    def row(self, i):
+        """Format satu hasil test menjadi dict yang bisa dibaca"""
+        current = self.data[self.offset + i]
+        mask = int(self.bbfs_mask[i])
+        return {
+            'test_no': i + 1,
+            'date': current['date'].strftime('%Y-%m-%d'),
+            'day': current['day'],
+            'input_2d': current['last_2d'],
+            'bbfs': [d for d in DIGIT_STRS if mask & DIGIT_BITS[d]],
+            'next_2d': self.data[self.offset + i + 1]['last_2d'],
+            'win': bool(self.win[i]),
+            'consecutive_losses': int(self.streak[i])
+        }
+
 
 class UltraSmartBBFS:
-    def __init__(self):
+    def __init__(self, seed=None, min_year=DEFAULT_MIN_YEAR, max_year=None, min_records=1200):
+        self.seed = seed
+        self.rng = PermutationStream.spawn(seed, "default")
         self.url = "http://178.128.121.191/"
+        self.min_year = min_year
+        self.max_year = max_year        # None = tanpa batas atas
+        self.min_records = min_records
         self.data = []
-        self.transition_matrix = {}
-        self.day_patterns = {}
-        self.digit_frequency = {}
+        self.data_version = None        # digest data (bagian key result cache)
+        self.date_index = None          # DateIndex untuk range query tanggal
+        self.features = None            # DigitFeatureIndex atas hasil 4D
+        self.transition_matrix = None   # (100, 100) count input_2d -> next_2d
+        self.day_patterns = None        # (7, 100, 100) count per hari
+        self.digit_frequency = None     # (100, 10) count digit setelah input_2d
+        self.frequency_rank = []        # per input: digit urut frequency desc
+        self.ultra_rank = []            # per input: digit urut bobot ultra_strategy
+        self.context_index = None       # (100, 10) jumlah konteks per digit setelah input_2d
+        self.multi_context = []         # per input: context_index > 1
+        self.sparse_context = None      # SparseContextIndex (last k 2D), opsional
         self.winning_sequences = []
         self.loss_patterns = {}
         self.best_strategy = None
+        self.result_cache = None        # ResultCache untuk intensive_search, opsional
         
     def load_and_process_data(self):
         """Load data dengan preprocessing yang lebih canggih"""
@@ -27,7 +118,7 @@ class UltraSmartBBFS:
             response = requests.get(self.url, timeout=30)
             content = response.text
             
-            pattern = r'<td title="([^"]*=\d{4}-\d{2}-\d{2}=[^"]*)">(\d{4})</td>'
+            pattern = r'<td title="([^"]*=\d{4}-\d{2}-\d{2}=[^"]*)">([0-9]{4})</td>'
             matches = re.findall(pattern, content)
             
             raw_data = []
@@ -42,90 +133,148 @@ class UltraSmartBBFS:
                     
                     try:
                         date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        if 2020 <= date_obj.year <= 2025:
+                        if self.in_year_range(date_obj):
                             day_std = self.standardize_day(day_name)
                             if day_std:
-                                raw_data.append({
-                                    'date': date_obj,
-                                    'day': day_std,
-                                    'result': result,
-                                    'last_2d': result[-2:],
-                                    'digits': [int(d) for d in result],
-                                    'digit_sum': sum(int(d) for d in result),
-                                    'digit_product': math.prod(int(d) for d in result if int(d) > 0),
-                                    'even_count': sum(1 for d in result if int(d) % 2 == 0),
-                                    'odd_count': sum(1 for d in result if int(d) % 2 == 1)
-                                })
+                                raw_data.append(self._make_record(date_obj, day_std, result))
                     except ValueError:
                         continue
             
             # Sort by date
             raw_data.sort(key=lambda x: x['date'])
             self.data = raw_data
+            self._index_data()
             
-            print(f"Loaded {len(self.data)} records from 2020-2025")
-            return len(self.data) >= 1200
+            print(f"Loaded {len(self.data)} records from {self.min_year}-{self.max_year or 'sekarang'}")
+            return len(self.data) >= self.min_records
             
         except Exception as e:
             print(f"Error loading data: {e}")
             return False
     
+    def in_year_range(self, date_obj):
+        """Cek apakah tanggal masuk range tahun yang dikonfigurasi"""
+        return self.min_year <= date_obj.year and (self.max_year is None or date_obj.year <= self.max_year)
+    
+    def _index_data(self):
+        """Build index vektor (fitur 4D, tanggal) setelah self.data diganti"""
+        self.features = DigitFeatureIndex.from_records(self.data, DAY_INDEX)
+        self.date_index = DateIndex(self.data, DAY_INDEX)
+        digest = hashlib.sha1()
+        for item in self.data:
+            digest.update(f"{item['date']:%Y-%m-%d}={item['result']};".encode('utf-8'))
+        self.data_version = digest.hexdigest()[:16]
+    
+    def data_bounds(self, start=None, end=None):
+        """Posisi (lo, hi) data dengan start <= tanggal <= end, tanpa menyalin data"""
+        if self.date_index is None or len(self.date_index) != len(self.data):
+            self._index_data()
+        return self.date_index.bounds(start, end)
+    
+    def _make_record(self, date_obj, day_std, result):
+        """Build satu record; fitur digit ada di self.features (vektor)"""
+        return {
+            'date': date_obj,
+            'day': day_std,
+            'result': result,
+            'last_2d': result[-2:]
+        }
+    
+    def load_snapshot(self, path=SNAPSHOT_PATH):
+        """Load data dari snapshot lokal (format sama dengan OptimizedBBFSSystem)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading snapshot: {e}")
+            return False
+        
+        raw_data = []
+        for row in payload.get('records', []):
+            try:
+                day_std = self.standardize_day(row.get('day', ''))
+                date_obj = datetime.strptime(row['date'], '%Y-%m-%d')
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+            # Baris rusak (hari tidak dikenal, result hilang / bukan 4 digit ASCII) dilewati
+            if not day_std or not isinstance(row.get('result'), str) or not RESULT_PATTERN.fullmatch(row['result']):
+                continue
+            if self.in_year_range(date_obj):
+                raw_data.append(self._make_record(date_obj, day_std, row['result']))
+        
+        raw_data.sort(key=lambda x: x['date'])
+        self.data = raw_data
+        self._index_data()
+        return len(self.data) >= 2
+    
+    def build_prediction_table(self, strategy_type="ultra"):
+        """Precompile BBFS strategi untuk semua kombinasi (day, input_2d)"""
+        if self.transition_matrix is None:
+            self.deep_pattern_analysis()
+        
+        table = {}
+        for day in DAYS:
+            for n in range(100):
+                input_2d = f"{n:02d}"
+                table[(day, input_2d)] = self.generate_smart_bbfs(input_2d, day, strategy_type)
+        return table
+    
     def standardize_day(self, day_name):
         """Standardize day names"""
-        day_map = {
-            'senin': 'Senin', 'monday': 'Senin', 'mon': 'Senin',
-            'selasa': 'Selasa', 'tuesday': 'Selasa', 'tue': 'Selasa', 
-            'rabu': 'Rabu', 'wednesday': 'Rabu', 'wed': 'Rabu',
-            'kamis': 'Kamis', 'thursday': 'Kamis', 'thu': 'Kamis',
-            'jumat': 'Jumat', 'friday': 'Jumat', 'fri': 'Jumat',
-            'sabtu': 'Sabtu', 'saturday': 'Sabtu', 'sat': 'Sabtu',
-            'minggu': 'Minggu', 'sunday': 'Minggu', 'sun': 'Minggu'
-        }
-        return day_map.get(day_name.lower().strip())
+        return DAY_MAP.get(day_name.lower().strip())
     
     def deep_pattern_analysis(self):
         """Analisis pola yang sangat mendalam"""
         print("Melakukan analisis pola ultra-mendalam...")
         
-        # Matrix transisi 2D -> 2D
-        transitions = defaultdict(list)
-        
-        # Pattern per hari
-        day_transitions = defaultdict(lambda: defaultdict(list))
-        
-        # Analisis digit frequency setelah input tertentu
-        digit_after_input = defaultdict(lambda: defaultdict(int))
-        
-        # Pattern loss sequences
-        loss_sequences = defaultdict(int)
-        
-        # Pattern winning after loss
-        win_after_loss = defaultdict(list)
-        
-        for i in range(len(self.data) - 1):
-            current = self.data[i]
-            next_item = self.data[i + 1]
-            
-            curr_2d = current['last_2d']
-            next_2d = next_item['last_2d']
-            day = current['day']
-            
-            # Basic transitions
-            transitions[curr_2d].append(next_2d)
-            day_transitions[day][curr_2d].append(next_2d)
-            
-            # Digit frequency analysis
-            for digit in next_2d:
-                digit_after_input[curr_2d][digit] += 1
+        n = len(self.data)
+        codes = np.fromiter((int(item['last_2d']) for item in self.data), dtype=np.int64, count=n)
+        days = np.fromiter((DAY_INDEX[item['day']] for item in self.data), dtype=np.int64, count=n)
+        curr, nxt, day = codes[:-1], codes[1:], days[:-1]
+        
+        # Matrix transisi 2D -> 2D (count), dan per hari
+        self.transition_matrix = np.bincount(
+            curr * 100 + nxt, minlength=100 * 100
+        ).astype(np.int32).reshape(100, 100)
+        self.day_patterns = np.bincount(
+            (day * 100 + curr) * 100 + nxt, minlength=7 * 100 * 100
+        ).astype(np.int32).reshape(7, 100, 100)
+        
+        # Digit frequency setelah input tertentu (100 x 10)
+        self.digit_frequency = self.transition_matrix @ DIGIT_COUNTS
+        
+        # Ranking top-k untuk semua input sekaligus (stable: tie -> digit terkecil).
+        # Bobot ultra = freq * 0.1 + 0.3 untuk digit input, dihitung dalam integer
+        # (x10) agar tie exact; context weight konstan per input sehingga tidak
+        # mengubah urutan
+        freq_order = np.argsort(-self.digit_frequency, axis=1, kind='stable')
+        ultra_weight = self.digit_frequency + (DIGIT_COUNTS > 0) * 3
+        ultra_order = np.argsort(-ultra_weight, axis=1, kind='stable')
+        self.frequency_rank = [
+            [DIGIT_STRS[d] for d in order if row[d] > 0]
+            for order, row in zip(freq_order.tolist(), self.digit_frequency.tolist())
+        ]
+        self.ultra_rank = [[DIGIT_STRS[d] for d in order] for order in ultra_order.tolist()]
+        
+        # Index cross-day: jumlah konteks (digit frequency + tiap hari) di mana
+        # digit pernah muncul setelah input_2d, (100, 10)
+        day_presence = (self.day_patterns @ DIGIT_COUNTS) > 0
+        self.context_index = (self.digit_frequency > 0).astype(np.int32) + day_presence.sum(axis=0, dtype=np.int32)
+        self.multi_context = (self.context_index > 1).tolist()
         
         # Advanced loss pattern analysis
         self.analyze_loss_patterns()
         
-        self.transition_matrix = dict(transitions)
-        self.day_patterns = dict(day_transitions)
-        self.digit_frequency = dict(digit_after_input)
-        
-        print(f"Completed deep analysis: {len(self.transition_matrix)} transition patterns")
+        observed = int(np.count_nonzero(self.transition_matrix.any(axis=1)))
+        print(f"Completed deep analysis: {observed} transition patterns")
+    
+    def build_sparse_context(self, max_order=3, use_weekday=False):
+        """Build index konteks orde tinggi (last k draw) untuk eksperimen"""
+        self.sparse_context = SparseContextIndex(max_order, use_weekday).extend(
+            [item['last_2d'] for item in self.data],
+            [DAY_INDEX[item['day']] for item in self.data]
+        )
+        return self.sparse_context
     
     def analyze_loss_patterns(self):
         """Analisis pola khusus untuk mengurangi consecutive losses"""
@@ -157,33 +306,40 @@ class UltraSmartBBFS:
         
         print(f"Loss pattern analysis complete: {len(self.loss_patterns)} patterns found")
     
-    def generate_basic_bbfs(self, input_2d, day):
+    def generate_basic_bbfs(self, input_2d, day, rng=None):
         """Basic BBFS generation untuk analisis"""
         digits = list(input_2d)
-        while len(digits) < 5:
-            new_digit = str(random.randint(0, 9))
-            if new_digit not in digits:
-                digits.append(new_digit)
+        (rng or self.rng).fill(digits)
         return digits[:5]
     
-    def generate_smart_bbfs(self, input_2d, day, strategy_type="ultra"):
+    def generate_smart_bbfs(self, input_2d, day, strategy_type="ultra", rng=None):
         """Generate BBFS dengan strategi ultra-cerdas"""
-        
+        return self.apply_strategy(strategy_type, self.smart_context(input_2d, day), rng)
+    
+    def smart_context(self, input_2d, day):
+        """Konteks satu step (input_2d, day, context_score, candidates); tanpa RNG
+        sehingga bisa dihitung sekali dan dibagi banyak strategi"""
         # Analisis konteks
         context_score = self.calculate_context_score(input_2d, day)
         
         # Kandidat digit berdasarkan multiple criteria
         candidates = self.get_smart_candidates(input_2d, day, context_score)
+        return input_2d, day, context_score, candidates
+    
+    def apply_strategy(self, strategy_type, context, rng=None):
+        """Jalankan satu strategi pada konteks dari smart_context"""
+        rng = rng or self.rng
+        input_2d, day, context_score, candidates = context
         
         # Apply different strategies based on type
         if strategy_type == "ultra":
-            return self.ultra_strategy(input_2d, candidates, context_score)
+            return self.ultra_strategy(input_2d, candidates, context_score, rng)
         elif strategy_type == "defensive":
-            return self.defensive_strategy(input_2d, candidates)
+            return self.defensive_strategy(input_2d, candidates, rng)
         elif strategy_type == "aggressive":
-            return self.aggressive_strategy(input_2d, candidates)
+            return self.aggressive_strategy(input_2d, candidates, rng)
         else:
-            return self.balanced_strategy(input_2d, candidates)
+            return self.balanced_strategy(input_2d, candidates, rng)
     
     def calculate_context_score(self, input_2d, day):
         """Hitung skor konteks untuk strategi adaptif"""
@@ -218,93 +374,48 @@ class UltraSmartBBFS:
     
     def get_smart_candidates(self, input_2d, day, context_score):
         """Dapatkan kandidat digit cerdas"""
-        candidates = set()
-        
-        # Dari transition matrix
-        if input_2d in self.transition_matrix:
-            for next_2d in self.transition_matrix[input_2d]:
-                candidates.update(next_2d)
-        
-        # Dari day patterns
-        if day in self.day_patterns and input_2d in self.day_patterns[day]:
-            for next_2d in self.day_patterns[day][input_2d]:
-                candidates.update(next_2d)
-        
-        # Dari digit frequency
-        if input_2d in self.digit_frequency:
-            freq_digits = sorted(self.digit_frequency[input_2d].items(), 
-                               key=lambda x: x[1], reverse=True)
-            candidates.update([d[0] for d in freq_digits[:8]])
+        # Digit yang pernah muncul setelah input (transition matrix; day patterns
+        # dan top-8 digit frequency adalah subset dari ini)
+        mask = self.digit_frequency[int(input_2d)] > 0
         
         # Add input digits
-        candidates.update(input_2d)
+        d1, d2 = int(input_2d[0]), int(input_2d[1])
+        mask[d1] = mask[d2] = True
         
         # Context-based additions
         if context_score > 1.5:
             # High context: add complementary digits
-            for digit in input_2d:
-                complement = str((10 - int(digit)) % 10)
-                candidates.add(complement)
+            mask[(10 - d1) % 10] = mask[(10 - d2) % 10] = True
         
-        return list(candidates)
+        return [DIGIT_STRS[d] for d in np.flatnonzero(mask)]
+    
+    def top_frequency_digits(self, input_2d, k):
+        """Top-k digit (freq > 0) setelah input, urut frequency desc lalu nilai digit"""
+        return self.frequency_rank[int(input_2d)][:k]
     
-    def ultra_strategy(self, input_2d, candidates, context_score):
+    def ultra_strategy(self, input_2d, candidates, context_score, rng=None):
         """Strategi ultra dengan optimization maksimal"""
         
-        # Weighted selection based on frequency and context
-        weighted_candidates = []
-        
-        for candidate in candidates:
-            weight = 1.0
-            
-            # Frequency weight
-            if input_2d in self.digit_frequency and candidate in self.digit_frequency[input_2d]:
-                weight += self.digit_frequency[input_2d][candidate] * 0.1
-            
-            # Context weight
-            weight += context_score * 0.2
-            
-            # Pattern weight
-            if candidate in input_2d:
-                weight += 0.3  # Boost input digits
-            
-            weighted_candidates.append((candidate, weight))
-        
-        # Sort by weight and select top 5
-        weighted_candidates.sort(key=lambda x: x[1], reverse=True)
-        
-        bbfs = []
-        for candidate, _ in weighted_candidates:
-            if candidate not in bbfs:
-                bbfs.append(candidate)
-            if len(bbfs) >= 5:
-                break
+        # Weighted selection based on frequency and context: urutan bobot
+        # sudah di-rank di deep_pattern_analysis, tinggal ambil top 5 kandidat
+        candidate_set = set(candidates)
+        bbfs = [d for d in self.ultra_rank[int(input_2d)] if d in candidate_set][:5]
         
         # Fill with random if needed
-        all_digits = [str(i) for i in range(10)]
-        while len(bbfs) < 5:
-            rand_digit = random.choice(all_digits)
-            if rand_digit not in bbfs:
-                bbfs.append(rand_digit)
+        (rng or self.rng).fill(bbfs)
         
         return bbfs[:5]
     
-    def defensive_strategy(self, input_2d, candidates):
+    def defensive_strategy(self, input_2d, candidates, rng=None):
         """Strategi defensif untuk minimize losses"""
         # Prioritize high-frequency digits
-        freq_candidates = []
-        
-        if input_2d in self.digit_frequency:
-            freq_items = sorted(self.digit_frequency[input_2d].items(), 
-                              key=lambda x: x[1], reverse=True)
-            freq_candidates = [d[0] for d in freq_items[:3]]
+        freq_candidates = self.top_frequency_digits(input_2d, 3)
         
         # Always include input digits
-        bbfs = list(set(input_2d + freq_candidates))
+        bbfs = list(dict.fromkeys(list(input_2d) + freq_candidates))
         
         # Fill remaining
-        remaining_candidates = [c for c in candidates if c not in bbfs]
-        random.shuffle(remaining_candidates)
+        remaining_candidates = (rng or self.rng).shuffle_digits([c for c in candidates if c not in bbfs])
         
         for candidate in remaining_candidates:
             if len(bbfs) >= 5:
@@ -321,7 +432,7 @@ class UltraSmartBBFS:
         
         return bbfs[:5]
     
-    def aggressive_strategy(self, input_2d, candidates):
+    def aggressive_strategy(self, input_2d, candidates, rng=None):
         """Strategi agresif untuk maximize wins"""
         # Use more diverse digit selection
         bbfs = []
@@ -332,22 +443,9 @@ class UltraSmartBBFS:
         # Add high-variance candidates
         remaining_candidates = [c for c in candidates if c not in bbfs]
         
-        # Prioritize digits that appear in multiple contexts
-        multi_context_digits = []
-        for candidate in remaining_candidates:
-            contexts = 0
-            if input_2d in self.digit_frequency and candidate in self.digit_frequency[input_2d]:
-                contexts += 1
-            
-            for day in self.day_patterns:
-                if input_2d in self.day_patterns[day]:
-                    for next_2d in self.day_patterns[day][input_2d]:
-                        if candidate in next_2d:
-                            contexts += 1
-                            break
-            
-            if contexts > 1:
-                multi_context_digits.append(candidate)
+        # Prioritize digits that appear in multiple contexts (context_index > 1)
+        multi_context = self.multi_context[int(input_2d)]
+        multi_context_digits = [c for c in remaining_candidates if multi_context[int(c)]]
         
         # Add multi-context digits first
         for digit in multi_context_digits:
@@ -357,17 +455,11 @@ class UltraSmartBBFS:
                 bbfs.append(digit)
         
         # Fill remaining randomly
-        all_digits = [str(i) for i in range(10)]
-        random.shuffle(all_digits)
-        for digit in all_digits:
-            if len(bbfs) >= 5:
-                break
-            if digit not in bbfs:
-                bbfs.append(digit)
+        (rng or self.rng).fill(bbfs)
         
         return bbfs[:5]
     
-    def balanced_strategy(self, input_2d, candidates):
+    def balanced_strategy(self, input_2d, candidates, rng=None):
         """Strategi balanced"""
         # Mix of defensive and aggressive
         bbfs = []
@@ -376,14 +468,12 @@ class UltraSmartBBFS:
         bbfs.extend(list(input_2d))
         
         # Add top frequency digit (defensive)
-        if input_2d in self.digit_frequency:
-            top_freq = max(self.digit_frequency[input_2d].items(), key=lambda x: x[1])
-            if top_freq[0] not in bbfs:
-                bbfs.append(top_freq[0])
+        top_freq = self.top_frequency_digits(input_2d, 1)
+        if top_freq and top_freq[0] not in bbfs:
+            bbfs.append(top_freq[0])
         
         # Add diverse candidates (aggressive)
-        remaining = [c for c in candidates if c not in bbfs]
-        random.shuffle(remaining)
+        remaining = (rng or self.rng).shuffle_digits([c for c in candidates if c not in bbfs])
         
         for candidate in remaining[:2]:
             if len(bbfs) >= 5:
@@ -400,52 +490,55 @@ class UltraSmartBBFS:
         
         return bbfs[:5]
     
-    def test_strategy_rigorously(self, strategy_func, strategy_name, max_allowed_losses=5):
-        """Test strategi dengan kriteria ketat"""
-        print(f"Testing {strategy_name} dengan kriteria maksimal {max_allowed_losses} kalah beruntun...")
-        
-        results = []
+    def test_strategy_rigorously(self, strategy_func, strategy_name, max_allowed_losses=5, start=None, end=None):
+        """Test strategi dengan kriteria ketat (opsional dalam range tanggal start..end)"""
         consecutive_losses = 0
         max_consecutive = 0
         total_wins = 0
-        total_tests = min(1200, len(self.data) - 1)
+        lo, hi = self.data_bounds(start, end)
+        total_tests = max(min(1200, hi - lo - 1), 0)
+        
+        # Hasil disimpan kolumnar; baris dict hanya dibuat saat ditampilkan
+        results = StrategyResults(self.data, total_tests, lo)
+        win_col, mask_col, streak_col = results.win, results.bbfs_mask, results.streak
+        data = self.data
         
         for i in range(total_tests):
-            current = self.data[i]
-            next_item = self.data[i + 1]
+            current = data[lo + i]
             
             # Generate BBFS
             bbfs = strategy_func(current['last_2d'], current['day'])
             
-            # Test win condition
-            bbfs_set = set(bbfs)
-            next_2d_set = set(next_item['last_2d'])
-            is_win = next_2d_set.issubset(bbfs_set)
+            # Test win condition: semua digit 2D berikutnya ada di BBFS (bitmask)
+            bbfs_mask = 0
+            for digit in bbfs:
+                bbfs_mask |= DIGIT_BITS[digit]
+            is_win = not (MASK_2D[data[lo + i + 1]['last_2d']] & ~bbfs_mask)
             
             if is_win:
                 consecutive_losses = 0
                 total_wins += 1
             else:
                 consecutive_losses += 1
-                max_consecutive = max(max_consecutive, consecutive_losses)
+                if consecutive_losses > max_consecutive:
+                    max_consecutive = consecutive_losses
             
-            results.append({
-                'test_no': i + 1,
-                'date': current['date'].strftime('%Y-%m-%d'),
-                'day': current['day'],
-                'input_2d': current['last_2d'],
-                'bbfs': bbfs,
-                'next_2d': next_item['last_2d'],
-                'win': is_win,
-                'consecutive_losses': consecutive_losses
-            })
+            win_col[i] = is_win
+            mask_col[i] = bbfs_mask
+            streak_col[i] = consecutive_losses
+            results.size = i + 1
             
             # Early termination if criteria not met
             if max_consecutive > max_allowed_losses and i > 200:
-                print(f"  Early termination: Max consecutive losses {max_consecutive} > {max_allowed_losses}")
                 break
         
-        win_rate = (total_wins / len(results) * 100) if results else 0
+        return self._strategy_performance(strategy_name, results, total_wins, max_consecutive, max_allowed_losses)
+    
+    def _strategy_performance(self, strategy_name, results, total_wins, max_consecutive, max_allowed_losses, verbose=True):
+        """Dict performa satu strategi (format test_strategy_rigorously)"""
+        total_wins = int(total_wins)
+        max_consecutive = int(max_consecutive)
+        win_rate = (total_wins / len(results) * 100) if len(results) else 0
         meets_criteria = max_consecutive <= max_allowed_losses
         
         performance = {
@@ -457,17 +550,154 @@ class UltraSmartBBFS:
             'meets_criteria': meets_criteria,
             'results': results
         }
-        
-        print(f"  Total tests: {len(results)}")
-        print(f"  Wins: {total_wins}")
-        print(f"  Win rate: {win_rate:.2f}%")
-        print(f"  Max consecutive losses: {max_consecutive}")
-        print(f"  Meets criteria: {'✓ YA' if meets_criteria else '✗ TIDAK'}")
-        
+        if verbose:
+            self.print_strategy_report(performance, max_allowed_losses)
         return performance
     
-    def intensive_search(self, max_iterations=100):
-        """Pencarian intensif strategi optimal"""
+    def print_strategy_report(self, performance, max_allowed_losses=5):
+        """Laporan satu strategi hasil test"""
+        max_consecutive = performance['max_consecutive_losses']
+        print(f"Testing {performance['strategy_name']} dengan kriteria maksimal {max_allowed_losses} kalah beruntun...")
+        # Early termination terjadi tepat jika batas terlampaui setelah test ke-201
+        if max_consecutive > max_allowed_losses and performance['total_tests'] > 201:
+            print(f"  Early termination: Max consecutive losses {max_consecutive} > {max_allowed_losses}")
+        
+        print(f"  Total tests: {performance['total_tests']}")
+        print(f"  Wins: {performance['wins']}")
+        print(f"  Win rate: {performance['win_rate']:.2f}%")
+        print(f"  Max consecutive losses: {max_consecutive}")
+        print(f"  Meets criteria: {'✓ YA' if performance['meets_criteria'] else '✗ TIDAK'}")
+    
+    def test_strategies_batch(self, strategies, max_allowed_losses=5, start=None, end=None, verbose=True):
+        """Test banyak strategi dalam satu pass data (multi_strategy_backtest).
+        
+        strategies: list (nama, func(context, loss_context)) dengan context dari
+        smart_context; hasil per strategi sama dengan test_strategy_rigorously.
+        """
+        lo, hi = self.data_bounds(start, end)
+        total_tests = max(min(1200, hi - lo - 1), 0)
+        data = self.data
+        
+        contexts = [self.smart_context(data[lo + i]['last_2d'], data[lo + i]['day']) for i in range(total_tests)]
+        targets = [MASK_2D[data[lo + i + 1]['last_2d']] for i in range(total_tests)]
+        batch = multi_strategy_backtest(contexts, targets, [func for _, func in strategies], max_allowed_losses)
+        
+        performances = []
+        for s, (name, _) in enumerate(strategies):
+            results = StrategyResults(data, total_tests, lo)
+            results.win[:] = batch['win'][:, s]
+            results.bbfs_mask[:] = batch['bbfs_mask'][:, s]
+            results.streak[:] = batch['streak'][:, s]
+            results.size = int(batch['size'][s])
+            performances.append(self._strategy_performance(
+                name, results, batch['wins'][s], batch['max_streak'][s], max_allowed_losses, verbose
+            ))
+        return performances
+    
+    def _strategy_cache_keys(self, strategy_type, iteration, seed, lo, hi, max_allowed_losses):
+        """(key deterministik, key dengan seed) satu evaluasi intensive_search.
+        
+        Key deterministik tidak memuat seed: dipakai untuk evaluasi yang tidak
+        pernah mengambil RNG (mis. ultra dengan kandidat >= 5 di setiap step),
+        sehingga hasilnya sama untuk semua iterasi dan seed.
+        """
+        method = {
+            "ultra": self.ultra_strategy, "defensive": self.defensive_strategy,
+            "aggressive": self.aggressive_strategy
+        }.get(strategy_type, self.balanced_strategy)
+        code = code_fingerprint(
+            method, self.apply_strategy, self.smart_context, self.calculate_context_score,
+            self.get_smart_candidates, self.deep_pattern_analysis, multi_strategy_backtest,
+            PermutationStream.fill, PermutationStream.shuffle_digits, PermutationStream._refill
+        )
+        base = ('intensive_search', strategy_type, code, self.data_version, (lo, hi), max_allowed_losses)
+        seeded = fingerprint(*base, (seed, iteration)) if seed is not None else None
+        return fingerprint(*base, None), seeded
+    
+    def evaluate_strategy_jobs(self, jobs, seed, start=None, end=None, cache=None, max_allowed_losses=5):
+        """Evaluasi job (strategy_type, iteration, stream) intensive_search.
+        
+        Dengan cache, job yang fingerprint-nya sudah ada tidak dihitung ulang;
+        sisanya dievaluasi bersama lewat test_strategies_batch lalu disimpan.
+        """
+        lo, hi = self.data_bounds(start, end)
+        total_tests = max(min(1200, hi - lo - 1), 0)
+        names = [f"{t.capitalize()}_Strategy_Iter{it}" for t, it, _ in jobs]
+        performances = [None] * len(jobs)
+        keys = [None] * len(jobs)
+        
+        if cache is not None:
+            for j, (strategy_type, iteration, _) in enumerate(jobs):
+                keys[j] = self._strategy_cache_keys(strategy_type, iteration, seed, lo, hi, max_allowed_losses)
+                entry = cache.get_any(keys[j])  # satu hit/miss per job
+                if entry is not None:
+                    results = StrategyResults(self.data, total_tests, lo)
+                    size = entry['size']
+                    results.win[:size] = entry['win']
+                    results.bbfs_mask[:size] = entry['bbfs_mask']
+                    results.streak[:size] = entry['streak']
+                    results.size = size
+                    performances[j] = self._strategy_performance(
+                        names[j], results, entry['wins'], entry['max_streak'], max_allowed_losses, verbose=False
+                    )
+        
+        pending = [j for j, performance in enumerate(performances) if performance is None]
+        new_entries = []
+        if pending:
+            evaluated = self.test_strategies_batch(
+                [(names[j], lambda context, loss_context, t=jobs[j][0], stream=jobs[j][2]:
+                  self.apply_strategy(t, context, stream)) for j in pending],
+                max_allowed_losses, start=start, end=end, verbose=False
+            )
+            for j, performance in zip(pending, evaluated):
+                performances[j] = performance
+                if cache is None:
+                    continue
+                results = performance['results']
+                size = len(results)
+                entry = {
+                    'win': results.win[:size].copy(),
+                    'bbfs_mask': results.bbfs_mask[:size].copy(),
+                    'streak': results.streak[:size].copy(),
+                    'size': size,
+                    'wins': performance['wins'],
+                    'max_streak': performance['max_consecutive_losses']
+                }
+                deterministic_key, seeded_key = keys[j]
+                # Stream yang tidak pernah generate blok = evaluasi tanpa randomness
+                if jobs[j][2].blocks_generated == 0:
+                    new_entries.append((deterministic_key, entry))
+                elif seeded_key is not None:
+                    new_entries.append((seeded_key, entry))
+        if new_entries:
+            cache.put_many(new_entries)
+        return performances
+    
+    def intensive_search(self, max_iterations=100, seed=None, start=None, end=None, batch_iterations=10, cache=None,
+                         mode="random", workers=None):
+        """Pencarian intensif strategi optimal.
+        
+        Setiap (strategi, iterasi) memakai stream RNG sendiri yang diturunkan
+        dari seed, sehingga seed yang sama memberi hasil identik. Strategi dari
+        batch_iterations iterasi dievaluasi bersama dalam satu pass data.
+        Dengan cache (default self.result_cache) evaluasi yang sudah pernah
+        dihitung - di run ini atau run sebelumnya - dipakai ulang.
+        
+        mode="evolutionary": GA strategy_optimizer (max_iterations generasi)
+        dengan fitness out-of-sample rolling-origin; result cache di-key spec
+        fold sehingga tidak tercampur dengan entry mode random.
+        """
+        seed = self.seed if seed is None else seed
+        cache = self.result_cache if cache is None else cache
+        if cache is not None:
+            cache.compact(self.data_version)  # entry data lama tidak akan cocok lagi
+        if mode == "evolutionary":
+            from strategy_optimizer import evolutionary_search  # lazy: strategy_optimizer mengimpor modul ini
+            print(f"Memulai pencarian evolusioner dengan {max_iterations} generasi (fitness out-of-sample)...")
+            performance, self.best_strategy = evolutionary_search(
+                self, generations=max_iterations, seed=seed, start=start, end=end, workers=workers, cache=cache
+            )
+            return performance
         print(f"Memulai pencarian intensif dengan {max_iterations} iterasi...")
         print("Target: Maksimal 5 kalah beruntun dengan 1200+ test")
         
@@ -476,19 +706,33 @@ class UltraSmartBBFS:
         
         strategy_types = ["ultra", "defensive", "aggressive", "balanced"]
         
+        batch = []
         for iteration in range(1, max_iterations + 1):
+            if not batch:
+                # Evaluasi batch iterasi berikutnya sekaligus (satu pass data)
+                jobs = []
+                for batch_iteration in range(iteration, min(iteration + batch_iterations, max_iterations + 1)):
+                    for strategy_type in strategy_types:
+                        stream = PermutationStream.spawn(seed, strategy_type, batch_iteration)
+                        jobs.append((strategy_type, batch_iteration, stream))
+                
+                performances = self.evaluate_strategy_jobs(jobs, seed, start, end, cache)
+                batch = list(zip(jobs, performances))[::-1]
+            
             print(f"\n--- Iterasi {iteration} ---")
             
-            for strategy_type in strategy_types:
+            for _ in strategy_types:
                 strategies_tested += 1
                 
-                def current_strategy(input_2d, day):
-                    return self.generate_smart_bbfs(input_2d, day, strategy_type)
+                (strategy_type, job_iteration, _), performance = batch.pop()
+                self.print_strategy_report(performance)
                 
-                performance = self.test_strategy_rigorously(
-                    current_strategy, 
-                    f"{strategy_type.capitalize()}_Strategy_Iter{iteration}"
-                )
+                # Stream prediksi di-spawn ulang dari (seed, strategi, iterasi): tidak
+                # bergantung pada berapa banyak stream job terpakai, yang berbeda
+                # antara evaluasi baru dan hit result cache
+                def current_strategy(input_2d, day, strategy_type=strategy_type,
+                                     stream=PermutationStream.spawn(seed, strategy_type, job_iteration)):
+                    return self.generate_smart_bbfs(input_2d, day, strategy_type, stream)
                 
                 # Update best if better
                 if (best_performance is None or 
@@ -515,6 +759,9 @@ class UltraSmartBBFS:
         
         print(f"\nSelesai pencarian intensif:")
         print(f"Total strategies tested: {strategies_tested}")
+        if cache is not None:
+            print(f"Result cache: {cache.stats['hits']} hit, {cache.stats['misses']} miss, "
+                  f"{cache.stats['loaded']} entry dari disk")
         if best_performance:
             if best_performance['meets_criteria']:
                 print("✓ Strategi optimal ditemukan!")
@@ -563,8 +810,10 @@ def main():
     # Deep analysis
     system.deep_pattern_analysis()
     
-    # Intensive search
-    best_result = system.intensive_search(max_iterations=50)
+    # Intensive search: GA dengan fitness out-of-sample (rolling-origin); backtest
+    # genome yang sudah pernah dihitung diambil dari cache disk
+    system.result_cache = ResultCache()
+    best_result = system.intensive_search(max_iterations=50, mode="evolutionary")
     
     if best_result:
         # Show results